@@ -1,138 +1,77 @@
 import pygame
-import random
+import sys
 import time
-from utils.sound import toggle_sound
-from utils.leaderboard import load_scores, save_score
-
-# Initialize Pygame and Pygame Mixer
-pygame.init()
-pygame.mixer.init()
-
-# Set up display
+from utils.core import (count_inversions, find_empty_tile, generate_solved_grid, get_valid_moves, init_grid,
+                        is_puzzle_completed, is_solvable, shuffle_grid, slide_tile)
+from utils.hints import HintService
+from utils.puzzle_bank import PuzzleBank
+from utils.render import RenderCache, default_picture
+from utils.replay import REPLAY_DIR, ReplayRecorder, save_replay
+from utils.scheduler import FrameScheduler
+from utils.sound import is_sound_enabled, toggle_sound
+from utils.leaderboard import Leaderboard
+from utils.profiler import FrameProfiler, profile_path_from_environment
+
+# Display size (the window itself is opened by init_display() when the game starts)
 SCREEN_WIDTH = 400
 SCREEN_HEIGHT = 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Slider Puzzle")
-
-# Load Sound Effect (Make sure the file path is correct)
-try:
-    move_sound = pygame.mixer.Sound("src/sounds/se.mp3")  
-    completion_sound = pygame.mixer.Sound("src/sounds/cs.wav")  # Completion sound
-except pygame.error as e:
-    print(f"Error loading sound: {e}")
+screen = None
+
+# Sound effects, loaded on the first one played
+move_sound = None
+completion_sound = None
+sounds_loaded = False
+
+# Function to open the window and set up the fonts (only the first call does anything)
+def init_display():
+    global screen, title_font, button_font, timer_font
+    if screen is None:
+        # Only video and fonts are needed to show the menu; the mixer starts with the first sound
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Slider Puzzle")
+        title_font = render_cache.font(50)
+        button_font = render_cache.font(35)
+        timer_font = render_cache.font(30)
+    return screen
+
+# Function to start the mixer and load the sound effects (Make sure the file paths are correct)
+def load_sounds():
+    global move_sound, completion_sound, sounds_loaded
+    sounds_loaded = True  # Only try once, even if there is no sound device
+    try:
+        pygame.mixer.init()
+        move_sound = pygame.mixer.Sound("src/sounds/se.mp3")  
+        completion_sound = pygame.mixer.Sound("src/sounds/cs.wav")  # Completion sound
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"Error loading sound: {e}")
 
 # Function to play the sound effect
 def play_move_sound():
+    if not is_sound_enabled():
+        return
+    if not sounds_loaded:
+        load_sounds()
     if move_sound:
         move_sound.play()
 
 def play_completion_sound():
+    if not is_sound_enabled():
+        return
+    if not sounds_loaded:
+        load_sounds()
     if completion_sound:
         completion_sound.play()
 
-# Function to check if a tile can move (is adjacent to the empty space)
-def is_adjacent(pos, empty_pos):
-    return (abs(pos[0] - empty_pos[0]) == 1 and pos[1] == empty_pos[1]) or \
-           (abs(pos[1] - empty_pos[1]) == 1 and pos[0] == empty_pos[0])
-
 # Function to move a tile if adjacent to the empty space
 def move_tile(grid, pos):
     global moves
-    empty_pos = [(i, j) for i, row in enumerate(grid) for j, val in enumerate(row) if val is None][0]
-    if is_adjacent(pos, empty_pos):
-        # Swap tiles
-        grid[empty_pos[0]][empty_pos[1]], grid[pos[0]][pos[1]] = grid[pos[0]][pos[1]], grid[empty_pos[0]][empty_pos[1]]
+    previous_empty = slide_tile(grid, pos)
+    if previous_empty != -1:
         moves += 1
         play_move_sound()  # Play sound effect when a tile is moved
-
-# Function to count the number of inversions in the grid
-def count_inversions(grid):
-    """Count the number of inversions in the grid."""
-    flat_grid = [tile for row in grid for tile in row if tile is not None]
-    inversions = 0
-    for i in range(len(flat_grid)):
-        for j in range(i + 1, len(flat_grid)):
-            if flat_grid[i] > flat_grid[j]:
-                inversions += 1
-    return inversions
-
-# Function to check if the puzzle is solvable
-def is_solvable(grid):
-    """Check if the grid is solvable."""
-    inversions = count_inversions(grid)
-    empty_pos = find_empty_tile(grid)
-    grid_size = len(grid)
-    
-    if grid_size % 2 == 1:  # Odd grid size
-        return inversions % 2 == 0
-    else:  # Even grid size
-        # Blank is on an even row from the bottom (counting from 1)
-        empty_row_from_bottom = grid_size - empty_pos[0]
-        if empty_row_from_bottom % 2 == 0:
-            return inversions % 2 == 1
-        else:
-            return inversions % 2 == 0
-
-# Function to shuffle the grid using valid moves and ensure solvability
-def shuffle_grid(grid, moves=100):
-    empty_pos = find_empty_tile(grid)
-    
-    while True:
-        for _ in range(moves):
-            valid_moves = get_valid_moves(grid, empty_pos)
-            next_move = random.choice(valid_moves)
-
-            # Swap the empty tile with the selected valid move
-            grid[empty_pos[0]][empty_pos[1]], grid[next_move[0]][next_move[1]] = \
-                grid[next_move[0]][next_move[1]], grid[empty_pos[0]][empty_pos[1]]
-            empty_pos = next_move  # Update the empty tile position
-        
-        if is_solvable(grid):
-            break  # Only return the grid if it is solvable
-    return grid
-
-# Function to generate a solved grid
-def generate_solved_grid(grid_size):
-    grid = list(range(1, grid_size * grid_size)) + [None]  # None represents the empty space
-    grid_2d = [grid[i * grid_size:(i + 1) * grid_size] for i in range(grid_size)]
-    return grid_2d
-
-# Function to find the position of the empty tile (None)
-def find_empty_tile(grid):
-    for i in range(len(grid)):
-        for j in range(len(grid[i])):
-            if grid[i][j] is None:
-                return i, j
-
-# Function to get the valid moves for the empty tile (None)
-def get_valid_moves(grid, empty_pos):
-    valid_moves = []
-    x, y = empty_pos
-    if x > 0:  # Can move up
-        valid_moves.append((x - 1, y))
-    if x < len(grid) - 1:  # Can move down
-        valid_moves.append((x + 1, y))
-    if y > 0:  # Can move left
-        valid_moves.append((x, y - 1))
-    if y < len(grid[0]) - 1:  # Can move right
-        valid_moves.append((x, y + 1))
-    return valid_moves
-
-# Function to check if the puzzle is completed
-def is_puzzle_completed(grid):
-    correct_grid = list(range(1, grid_size * grid_size)) + [None]  # The correct order of the grid
-    flattened_grid = [item for row in grid for item in row]  # Flatten the grid to compare easily
-    return flattened_grid == correct_grid
-
-# Function to initialize a shuffled grid based on selected size
-def init_grid(grid_size):
-    # Step 1: Generate the solved grid
-    grid = generate_solved_grid(grid_size)
-    
-    # Step 2: Shuffle the grid using valid moves to ensure solvability
-    grid = shuffle_grid(grid, moves=100)
-    
-    return grid
+    return previous_empty  # -1 if the tile could not move
 
 # Define Colors
 WHITE = (255, 255, 255)
@@ -140,14 +79,17 @@ BLACK = (0, 0, 0)
 PURPLE = (102, 102, 153)
 LIGHT_PURPLE = (153, 153, 204)
 
-# Set up fonts
-title_font = pygame.font.SysFont("Roboto Mono", 50)
-button_font = pygame.font.SysFont("Roboto Mono", 35)
-timer_font = pygame.font.SysFont("Roboto Mono", 30)
+# Fonts, created by init_display() from the render cache
+title_font = None
+button_font = None
+timer_font = None
 
 # Set up clock for frame rate
 clock = pygame.time.Clock()
 
+# Fonts and pre-rendered tiles for the game board
+render_cache = RenderCache()
+
 # Game states to control screen transitions
 MENU = "menu"
 GRID_SELECTION = "grid_selection"
@@ -156,6 +98,17 @@ COMPLETED = "completed"
 current_screen = MENU
 
 grid_size = None  # To store the selected grid size
+grid = None  # The board being played
+difficulty = "medium"  # Puzzle bank difficulty band for new games
+puzzle_bank = None  # Created when the game starts
+hint_service = None  # Created when the game starts
+leaderboard = None  # Opened when the game starts; utils.headless gives scripted runs a throwaway one
+replay_dir = REPLAY_DIR  # Where finished games are saved; utils.headless redirects it too
+hint_tile = None  # Board index of the tile highlighted as a hint
+PICTURE_FILE = "src/images/picture.png"  # Source image for picture mode; a built-in one is drawn if it is missing
+picture = None  # Loaded the first time picture mode is turned on
+picture_mode = False  # Draw pieces of the picture instead of numbered tiles
+profiler = None  # FrameProfiler while profiling is on (see utils.profiler)
 moves = 0  # To track moves
 start_time = None  # To track the start time of the game
 total_elapsed_time = 0  # To store the total time once the game is completed
@@ -165,7 +118,7 @@ def draw_main_menu():
     screen.fill(PURPLE)
     
     # Title
-    title_text = title_font.render("Slider Puzzle", True, WHITE)
+    title_text = render_cache.text(title_font, "Slider Puzzle", WHITE)
     screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 50))
     
     # Button configurations
@@ -177,7 +130,7 @@ def draw_main_menu():
     button_gap = 30
 
     for i, text in enumerate(buttons):
-        btn_text = button_font.render(text, True, WHITE)
+        btn_text = render_cache.text(button_font, text, WHITE)
         btn_rect = pygame.Rect(SCREEN_WIDTH // 2 - button_width // 2, button_y_start + i * (button_height + button_gap), button_width, button_height)
         button_rects.append((btn_rect, text))  # Add button rect and its label (to know which was clicked)
         pygame.draw.rect(screen, LIGHT_PURPLE, btn_rect, border_radius=10)
@@ -197,7 +150,7 @@ def draw_grid_selection():
     screen.fill(PURPLE)
 
     # Title
-    title_text = title_font.render("Classic", True, WHITE)
+    title_text = render_cache.text(title_font, "Classic", WHITE)
     screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 50))
 
     # Button configurations
@@ -209,14 +162,14 @@ def draw_grid_selection():
     button_gap = 20
 
     for i, size in enumerate(grid_sizes):
-        btn_text = button_font.render(size, True, WHITE)
+        btn_text = render_cache.text(button_font, size, WHITE)
         btn_rect = pygame.Rect(SCREEN_WIDTH // 2 - button_width // 2, button_y_start + i * (button_height + button_gap), button_width, button_height)
         button_rects.append((btn_rect, size))  # Add button rect and its label (to know which was clicked)
         pygame.draw.rect(screen, LIGHT_PURPLE, btn_rect, border_radius=10)
         screen.blit(btn_text, (btn_rect.x + (button_width - btn_text.get_width()) // 2, btn_rect.y + (button_height - btn_text.get_height()) // 2))
 
     # Back button
-    back_text = button_font.render("<", True, WHITE)
+    back_text = render_cache.text(button_font, "<", WHITE)
     back_rect = pygame.Rect(20, 20, 40, 40)  # Small button in the corner
     button_rects.append((back_rect, "Back"))
     pygame.draw.rect(screen, LIGHT_PURPLE, back_rect, border_radius=10)
@@ -224,25 +177,40 @@ def draw_grid_selection():
 
     return button_rects
 
-# Function to draw the game board
-def draw_game_board(grid, elapsed_time):
-    global moves
-
-    screen.fill(PURPLE)
-
-    # Dynamically adjust tile size and font size based on grid size
-    tile_size = SCREEN_WIDTH // grid_size  # Adjust tile size based on the grid size
-    font_size = tile_size // 2  # Adjust font size relative to tile size
-    tile_font = pygame.font.SysFont("Roboto Mono", font_size)
-    margin = 10
-
-    for i in range(len(grid)):
-        for j in range(len(grid[i])): 
-            tile = grid[i][j]
-            if tile:
-                pygame.draw.rect(screen, LIGHT_PURPLE, (j * tile_size + margin, i * tile_size + margin + 100, tile_size - margin, tile_size - margin))
-                text = tile_font.render(str(tile), True, WHITE)
-                screen.blit(text, (j * tile_size + margin + (tile_size - text.get_width()) // 2, i * tile_size + margin + 100 + (tile_size - text.get_height()) // 2))
+# Function to get the tile atlas for the board being played (built once per size and picture)
+def get_atlas():
+    tile_size = SCREEN_WIDTH // grid_size
+    image = picture if picture_mode else None
+    return render_cache.atlas(grid_size, tile_size, 10, (0, 100), LIGHT_PURPLE, WHITE, PURPLE, image)
+
+# Function to draw the tiles at some board indexes in one batch and return their rects
+def draw_tiles(grid, indexes):
+    atlas = get_atlas()
+    screen.blits(atlas.blits(grid.tiles, indexes), doreturn=False)
+    if hint_tile is not None and hint_tile in indexes:
+        pygame.draw.rect(screen, WHITE, atlas.rects[hint_tile], 3)  # Outline the hinted tile
+    return [atlas.rects[index] for index in indexes]
+
+# Function to switch between numbered tiles and the picture, loading the picture the first time
+def toggle_picture_mode():
+    global picture_mode, picture
+    if not picture_mode and picture is None:
+        try:
+            picture = render_cache.image(PICTURE_FILE)
+        except FileNotFoundError:
+            picture = default_picture(SCREEN_WIDTH)  # No picture of your own, so use the built-in one
+        except pygame.error as e:
+            print(f"Error loading picture: {e}")
+            picture = default_picture(SCREEN_WIDTH)
+    picture_mode = not picture_mode
+    return picture_mode
+
+# Function to draw the move count, timer and distance readout and return their rects
+def draw_game_status(elapsed_time):
+    status_rect = pygame.Rect(0, 0, SCREEN_WIDTH, 60)  # Above the back button and the tiles
+    distance_rect = pygame.Rect(80, 60, SCREEN_WIDTH - 80, 40)  # Beside the back button
+    screen.fill(PURPLE, status_rect)
+    screen.fill(PURPLE, distance_rect)
 
     # Display move count
     move_text = button_font.render(f"Moves: {moves}", True, WHITE)
@@ -252,21 +220,43 @@ def draw_game_board(grid, elapsed_time):
     time_text = timer_font.render(f"Time: {elapsed_time // 60:02}:{elapsed_time % 60:02}", True, WHITE)
     screen.blit(time_text, (SCREEN_WIDTH - 160, 20))
 
+    # Display how far the tiles are from home, which the board keeps up to date on every move
+    distance_text = timer_font.render(f"Distance: {grid.distance}", True, WHITE)
+    screen.blit(distance_text, (SCREEN_WIDTH - 20 - distance_text.get_width(), 70))
+
+    return [status_rect, distance_rect]
+
+# Function to draw the game board
+def draw_game_board(grid, elapsed_time):
+    screen.fill(PURPLE)
+
+    # Every tile is a view into one atlas, so the whole board is a single blits() call
+    draw_tiles(grid, range(grid_size * grid_size))
+
+    draw_game_status(elapsed_time)
+
     # Back button
-    back_text = button_font.render("<", True, WHITE)
+    back_text = render_cache.text(button_font, "<", WHITE)
     back_rect = pygame.Rect(20, 60, 40, 40)  # Small button in the corner
     pygame.draw.rect(screen, LIGHT_PURPLE, back_rect, border_radius=10)
     screen.blit(back_text, (back_rect.x + (40 - back_text.get_width()) // 2, back_rect.y + (40 - back_text.get_height()) // 2))
 
     return back_rect
 
+# Function to redraw only what changed on the game board and return the dirty rects
+def update_game_board(grid, elapsed_time, dirty_tiles, status_changed):
+    dirty_rects = draw_tiles(grid, dirty_tiles)
+    if status_changed:
+        dirty_rects += draw_game_status(elapsed_time)
+    return dirty_rects
+
 # Function to draw the "Completed" screen
 def draw_completion_screen(elapsed_time):
     screen.fill(PURPLE)
     
     # Completion message
-    completed_text = title_font.render("Completed!", True, WHITE)
-    congrats_text = button_font.render("CONGRATULATIONS <3", True, WHITE)
+    completed_text = render_cache.text(title_font, "Completed!", WHITE)
+    congrats_text = render_cache.text(button_font, "CONGRATULATIONS <3", WHITE)
     screen.blit(completed_text, (SCREEN_WIDTH // 2 - completed_text.get_width() // 2, 150))
     screen.blit(congrats_text, (SCREEN_WIDTH // 2 - congrats_text.get_width() // 2, 230))
     
@@ -279,51 +269,147 @@ def draw_completion_screen(elapsed_time):
     screen.blit(time_text, (SCREEN_WIDTH // 2 - time_text.get_width() // 2, 350))
 
     # Back to Menu button
-    back_text = button_font.render("Back to Menu", True, WHITE)
+    back_text = render_cache.text(button_font, "Back to Menu", WHITE)
     back_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, 400, 200, 50)
     pygame.draw.rect(screen, LIGHT_PURPLE, back_rect, border_radius=10)
     screen.blit(back_text, (SCREEN_WIDTH // 2 - back_text.get_width() // 2, 410))
 
     # Play Again button
-    play_again_text = button_font.render("Play Again", True, WHITE)
+    play_again_text = render_cache.text(button_font, "Play Again", WHITE)
     play_again_rect = pygame.Rect(SCREEN_WIDTH // 2 - 100, 470, 200, 50)
     pygame.draw.rect(screen, LIGHT_PURPLE, play_again_rect, border_radius=10)
     screen.blit(play_again_text, (SCREEN_WIDTH // 2 - play_again_text.get_width() // 2, 480))
 
     return back_rect, play_again_rect
 
+# Function to turn on the frame profiler and time the hot functions
+def start_profiling():
+    global profiler
+    if profiler is None:
+        profiler = FrameProfiler()
+        game = sys.modules[__name__]
+        # The wrappers replace the module globals, so main() picks them up without any checks of its own
+        for name, phase in (("move_tile", "move"), ("is_puzzle_completed", "check"), ("draw_game_board", "draw"),
+                            ("update_game_board", "update")):
+            profiler.instrument(game, name, phase)
+        # New boards come from the puzzle bank, which generates one on the spot when it has none ready
+        profiler.instrument(PuzzleBank, "pop", "generate")
+    return profiler
+
+# Function to draw the profiler overlay along the bottom of the screen and return its rect
+def draw_profile_overlay():
+    font = render_cache.font(16)
+    lines = profiler.overlay_lines()
+    line_height = 14
+    overlay_rect = pygame.Rect(0, SCREEN_HEIGHT - line_height * len(lines) - 4, SCREEN_WIDTH, line_height * len(lines) + 4)
+    screen.fill(BLACK, overlay_rect)
+    for i, line in enumerate(lines):
+        screen.blit(font.render(line, True, WHITE), (4, overlay_rect.y + 2 + i * line_height))
+    return overlay_rect
+
 # Main loop
-def main():
-    global current_screen, grid_size, moves, start_time, total_elapsed_time
+def main(scheduler=None):
+    global current_screen, grid_size, grid, moves, start_time, total_elapsed_time, puzzle_bank, hint_service, hint_tile
+    global leaderboard
+    init_display()
+    if leaderboard is None:
+        leaderboard = Leaderboard()
+    if puzzle_bank is None:
+        puzzle_bank = PuzzleBank()
+        puzzle_bank.start()  # Fill the bank in the background while the menu is up
+    if hint_service is None:
+        hint_service = HintService()
+        hint_service.start()  # Searches for hints in the background as the player moves
     running = True
-    grid = None  # Initialize grid
+    drawn_screen = None  # Screen currently shown, to know when the game board needs a full redraw
+    dirty_tiles = []  # Board indexes changed since the last frame
+    drawn_status = None  # (moves, seconds) shown in the status strip
+    if scheduler is None:
+        scheduler = FrameScheduler()  # utils.headless passes a scripted one instead
 
     while running:
-        elapsed_time = 0
-        if current_screen == MENU:
-            button_rects = draw_main_menu()  # Draw the buttons and retrieve their rects
-        elif current_screen == GRID_SELECTION:
-            button_rects = draw_grid_selection()  # Draw grid size selection screen
-        elif current_screen == GAME:
-            elapsed_time = int(time.time() - start_time)  # Calculate elapsed time
-            back_rect = draw_game_board(grid, elapsed_time)  # Draw the game board and get back_rect
+        # Only draw when input, the timer or an animation changed something
+        if scheduler.dirty:
+            if profiler is not None:
+                profiler.begin_frame()
+            shown_screen = current_screen
+            elapsed_time = 0
+            dirty_rects = None  # None means the whole screen is flipped
+            if current_screen == MENU:
+                button_rects = draw_main_menu()  # Draw the buttons and retrieve their rects
+            elif current_screen == GRID_SELECTION:
+                button_rects = draw_grid_selection()  # Draw grid size selection screen
+            elif current_screen == GAME:
+                elapsed_time = int(time.time() - start_time)  # Calculate elapsed time
+                if drawn_screen != GAME:
+                    back_rect = draw_game_board(grid, elapsed_time)  # Draw the game board and get back_rect
+                else:
+                    # Only redraw the tiles a move touched and the status strip when it changes
+                    dirty_rects = update_game_board(grid, elapsed_time, dirty_tiles, drawn_status != (moves, elapsed_time))
+                dirty_tiles = []
+                drawn_status = (moves, elapsed_time)
         
-            # Check if the puzzle is completed
-            if is_puzzle_completed(grid):
-                total_elapsed_time = elapsed_time  # Store the total time once the game is completed
-                current_screen = COMPLETED
-                play_completion_sound()  # Play completion sound if available
-
-        elif current_screen == COMPLETED:
-            back_rect, play_again_rect = draw_completion_screen(total_elapsed_time)  # Show the completion screen
-
-        for event in pygame.event.get():
+                # Check if the puzzle is completed
+                if is_puzzle_completed(grid):
+                    total_elapsed_time = elapsed_time  # Store the total time once the game is completed
+                    leaderboard.add_score("Player", moves, total_elapsed_time, mode="classic", grid_size=grid_size)
+                    save_replay(recorder.encode(), f"{int(start_time)}-{grid_size}x{grid_size}-{moves}", replay_dir)
+                    current_screen = COMPLETED
+                    play_completion_sound()  # Play completion sound if available
+
+            elif current_screen == COMPLETED:
+                back_rect, play_again_rect = draw_completion_screen(total_elapsed_time)  # Show the completion screen
+            drawn_screen = shown_screen
+            if profiler is not None and profiler.overlay_visible:
+                overlay_rect = draw_profile_overlay()
+                if dirty_rects is not None:
+                    dirty_rects.append(overlay_rect)
+
+            if profiler is not None:
+                flip_start = time.perf_counter()
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)  # Push only the parts of the board that changed
+            if profiler is not None:
+                profiler.add("flip", time.perf_counter() - flip_start)
+                profiler.end_frame()
+            scheduler.frame_drawn()
+            clock.tick(30)  # Never redraw faster than 30 FPS
+            if current_screen != drawn_screen:
+                # The screen changed while drawing (e.g. the puzzle was completed), so show it before handling clicks
+                scheduler.invalidate()
+                continue
+            if current_screen == GAME:
+                scheduler.schedule(start_time + elapsed_time + 1 - time.time())  # Wake up when the timer ticks over
+
+        events = scheduler.wait()  # Sleeps until there is input or a redraw is due
+        if profiler is not None:
+            events_start = time.perf_counter()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
+            # Press F3 to show or hide the profiler overlay
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and profiler is not None:
+                profiler.overlay_visible = not profiler.overlay_visible
+                drawn_screen = None  # Redraw in full so a hidden overlay is wiped
+
+            # Press H on the game board for a hint
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_h and current_screen == GAME:
+                hint = hint_service.hint(grid)  # Never blocks: optimal if the search is done, greedy otherwise
+                if hint is not None:
+                    hint_tile = grid.index(*hint)
+                    dirty_tiles.append(hint_tile)
+
+            # Press P on the game board to switch between numbers and the picture
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_p and current_screen == GAME:
+                toggle_picture_mode()
+                drawn_screen = None  # Every tile changes, so draw the board in full
+
             # Check if the mouse is clicked
             if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()  # Get the mouse position
+                mouse_pos = event.pos  # Get the mouse position
 
                 if current_screen == MENU:
                     clicked_button = check_button_click(mouse_pos, button_rects)  # Check if any button was clicked
@@ -349,20 +435,32 @@ def main():
                     elif clicked_button:
                         # Set grid size and initialize grid
                         grid_size = int(clicked_button[0])
-                        grid = init_grid(grid_size)
+                        game_seed, grid = puzzle_bank.pop(grid_size, difficulty)  # Ready-made; the seed is kept for the replay
                         moves = 0
                         start_time = time.time()  # Start the timer
+                        recorder = ReplayRecorder(grid_size, game_seed, start_time)
+                        hint_service.update(grid)  # Start looking for hints right away
+                        hint_tile = None
                         current_screen = GAME  # Go to the game proper
+                        drawn_screen = None  # New board, so draw it in full
 
                 elif current_screen == GAME:
                     if back_rect.collidepoint(mouse_pos):
+                        hint_service.cancel()  # No point searching for a board nobody is playing
                         current_screen = GRID_SELECTION  # Go back to grid selection
                     else:
                         # Get tile clicked
                         tile_x = (mouse_pos[1] - 100) // (SCREEN_WIDTH // grid_size)
                         tile_y = mouse_pos[0] // (SCREEN_WIDTH // grid_size)
                         if 0 <= tile_x < grid_size and 0 <= tile_y < grid_size:
-                            move_tile(grid, (tile_x, tile_y))  # Play sound when the tile moves
+                            previous_empty = move_tile(grid, (tile_x, tile_y))  # Play sound when the tile moves
+                            if previous_empty != -1:
+                                dirty_tiles += [previous_empty, grid.blank]
+                                recorder.record(previous_empty, grid.blank)
+                                hint_service.update(grid, previous_empty)  # Cancels the search for the old board
+                                if hint_tile is not None:
+                                    dirty_tiles.append(hint_tile)
+                                    hint_tile = None
 
                 elif current_screen == COMPLETED:
                     # Handle the back to menu and play again clicks
@@ -370,15 +468,26 @@ def main():
                         current_screen = MENU  # Go back to the main menu
                     elif play_again_rect.collidepoint(mouse_pos):
                         # Reset the game and start over
-                        grid = init_grid(grid_size)
+                        game_seed, grid = puzzle_bank.pop(grid_size, difficulty)
                         moves = 0
                         start_time = time.time()  # Reset the timer
+                        recorder = ReplayRecorder(grid_size, game_seed, start_time)
+                        hint_service.update(grid)
+                        hint_tile = None
                         current_screen = GAME
-
-        pygame.display.flip()
-        clock.tick(30)
-
-    pygame.quit()
+                        drawn_screen = None
+        if profiler is not None and events:
+            profiler.add("events", time.perf_counter() - events_start)
 
 if __name__ == "__main__":
+    profile_path = profile_path_from_environment()  # Set SLIDER_PROFILE=1 to profile
+    if profile_path:
+        start_profiling()
     main()
+    leaderboard.close()
+    puzzle_bank.close()  # Saves the remaining puzzles for next time
+    hint_service.close()
+    if profiler is not None:
+        print(f"Wrote {profiler.export(profile_path)}")
+        profiler.close()
+    pygame.quit()
@@ -0,0 +1,107 @@
+import random
+import pytest
+from utils.board import Board, get_neighbours
+from utils.core import (find_empty_tile, generate_solved_grid, get_valid_moves, is_puzzle_completed, shuffle_grid,
+                        slide_tile)
+from utils.generator import generate_board
+
+
+def assert_counters_match(board):
+    fresh = Board(board.size, board.tiles)
+    assert (board.blank, board.misplaced, board.distance) == (fresh.blank, fresh.misplaced, fresh.distance)
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 7])
+def test_counters_follow_moves_and_undos(size):
+    rng = random.Random(size)
+    board = generate_board(size, seed=size)
+    history = []
+    for _ in range(2000):
+        if history and rng.random() < 0.3:
+            board.undo(history.pop())
+        else:
+            history.append(board.move(rng.choice(board.valid_moves())))
+        assert_counters_match(board)
+
+
+def test_counters_on_the_solved_board():
+    board = Board(4)
+    assert board.misplaced == board.distance == 0 and board.is_solved()
+    previous_empty = board.move(board.index(3, 2))
+    assert board.misplaced == 1 and board.distance == 1 and not board.is_solved()
+    board.undo(previous_empty)
+    assert board.is_solved()
+
+
+def test_writes_through_the_grid_view_keep_the_counters():
+    board = generate_board(3, seed=4)
+    rng = random.Random(0)
+    for _ in range(200):
+        (a, b), (c, d) = [divmod(rng.randrange(9), 3) for _ in range(2)]
+        board[a][b], board[c][d] = board[c][d], board[a][b]  # The swap shuffle_grid() uses
+        assert_counters_match(board)
+
+
+def test_writing_over_the_empty_space():
+    board = Board(3, [1, 2, 3, 4, 5, 6, 7, 0, 8])
+    board[2][1] = 5  # No empty space left
+    assert board.blank == -1
+    assert board.valid_moves() == () and not board.is_adjacent(8)
+    assert board.move(8) == -1
+    board[1][1] = None
+    assert board.blank == 4
+    assert_counters_match(board)
+
+
+def test_grid_view_matches_a_list_of_lists():
+    grid = [[5, 6, 7], [4, 3, None], [8, 2, 1]]
+    board = Board.from_grid(grid)
+    assert board.tiles == bytearray([5, 6, 7, 4, 3, 0, 8, 2, 1]) and board.blank == 5
+    assert len(board) == 3 and len(board[0]) == 3
+    assert [list(row) for row in board] == grid == board.to_grid()
+    assert board[1][2] is None and board[-1][-1] == 1 and board[1] == [4, 3, None]
+    with pytest.raises(IndexError):
+        board[3]
+    with pytest.raises(IndexError):
+        board[0][3]
+
+
+def test_copy_and_equality():
+    board = generate_board(4, seed=2)
+    other = board.copy()
+    assert other == board and hash(other) == hash(board)
+    other.move(other.valid_moves()[0])
+    assert other != board
+    assert list(board.to_array()) == list(board.tiles)
+
+
+def test_board_needs_every_cell():
+    with pytest.raises(ValueError):
+        Board(3, [1, 2, 3, 0])
+
+
+@pytest.mark.parametrize("size", [2, 3, 5])
+def test_moves_follow_the_neighbour_table(size):
+    board = generate_board(size, seed=1)
+    neighbours = get_neighbours(size)
+    for index in range(size * size):
+        assert board.is_adjacent(index) == (index in neighbours[board.blank])
+        if index != board.blank and index not in neighbours[board.blank]:
+            assert board.move(index) == -1
+    index = board.valid_moves()[0]
+    tile = board.tiles[index]
+    previous_empty = board.move(index)
+    assert board.blank == index and board.tiles[previous_empty] == tile
+
+
+def test_core_functions_work_on_boards_and_grids():
+    grid = generate_solved_grid(4)
+    board = Board.from_grid(grid)
+    assert find_empty_tile(board) == find_empty_tile(grid) == (3, 3)
+    assert get_valid_moves(board, (3, 3)) == get_valid_moves(grid, (3, 3))
+    assert is_puzzle_completed(board) and is_puzzle_completed(grid)
+    assert slide_tile(board, (0, 0)) == -1
+    assert slide_tile(board, (3, 2)) == 15 and board.empty_position() == (3, 2)
+    assert not is_puzzle_completed(board)
+    shuffle_grid(board, moves=50)
+    assert_counters_match(board)
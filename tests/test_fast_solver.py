@@ -0,0 +1,54 @@
+import pytest
+from utils.fast_solver import _cancel_reversals, solve_fast, solve_fast_report
+from utils.generator import generate_board
+from utils.solver import UnsolvableError, linear_conflict_distance, solve
+
+
+def play(board, solution):
+    for row, col in solution:
+        assert board.move(board.index(row, col)) != -1
+    return board.is_solved()
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5, 6, 8, 10])
+def test_solutions_solve_the_board(size):
+    for seed in range(3):
+        board = generate_board(size, seed=seed)
+        assert play(board, solve_fast(board.to_grid()))
+
+
+def test_small_boards_are_solved_optimally():
+    # Boards of 3x3 and below go straight to the optimal finish
+    for seed in range(10):
+        grid = generate_board(3, seed=seed).to_grid()
+        assert len(solve_fast(grid)) == len(solve(grid))
+
+
+def test_report():
+    grid = generate_board(6, seed=4).to_grid()
+    report = solve_fast_report(grid, time_budget=0)
+    assert report["attempts"] == 1  # The first order always finishes, whatever the budget
+    assert report["length"] == len(report["moves"])
+    assert report["lower_bound"] == linear_conflict_distance(grid)
+    assert report["length"] >= report["lower_bound"]
+    assert report["ratio"] == report["length"] / report["lower_bound"]
+    assert solve_fast_report(grid, time_budget=1)["length"] <= report["length"]
+
+
+def test_report_on_a_solved_board():
+    report = solve_fast_report([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, None]])
+    assert report["moves"] == [] and report["ratio"] == 1.0
+
+
+def test_reversals_are_cancelled():
+    # The blank goes 8 -> 7 -> 8 -> 5: the first two moves undo each other
+    assert _cancel_reversals(8, [7, 8, 5]) == [5]
+    assert _cancel_reversals(8, [7, 6, 7, 8]) == []
+
+
+def test_bad_boards():
+    with pytest.raises(UnsolvableError):
+        solve_fast([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 15, 14, None]])
+    for grid in ([[1, 1, 3], [4, 5, 6], [7, 8, None]], [[1, 2], [3]]):
+        with pytest.raises(ValueError, match="Board must"):
+            solve_fast(grid)
@@ -0,0 +1,58 @@
+from collections import Counter
+import numpy as np
+import pytest
+from utils.generator import generate_board, generate_boards
+from utils.solvability import is_flat_solvable
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 6])
+def test_boards_are_solvable_and_unsolved(size):
+    for seed in range(200):
+        board = generate_board(size, seed=seed)
+        assert sorted(board.tiles) == list(range(size * size))
+        assert is_flat_solvable(list(board.tiles), size)
+        assert not board.is_solved()
+
+
+def test_seeds_are_reproducible():
+    assert generate_board(4, seed=42) == generate_board(4, seed=42)
+    assert generate_board(4, seed=42) != generate_board(4, seed=43)
+
+
+def test_all_2x2_boards_are_drawn_evenly():
+    # 12 solvable 2x2 boards, less the solved one
+    counts = Counter(bytes(generate_board(2, seed=seed).tiles) for seed in range(11000))
+    assert len(counts) == 11
+    assert min(counts.values()) > 800 and max(counts.values()) < 1200
+
+
+@pytest.mark.parametrize("size", [2, 3, 5])
+def test_bulk_boards_are_solvable_and_unsolved(size):
+    boards = generate_boards(3000, size, seed=1, chunk_size=700)
+    assert boards.shape == (3000, size, size) and boards.dtype == np.uint8
+    flat = boards.reshape(3000, size * size)
+    solved = list(range(1, size * size)) + [0]
+    for tiles in flat.tolist():
+        assert sorted(tiles) == list(range(size * size))
+        assert is_flat_solvable(tiles, size)
+        assert tiles != solved
+
+
+def test_bulk_2x2_boards_are_drawn_evenly():
+    counts = Counter(bytes(tiles) for tiles in generate_boards(11000, 2, seed=3).reshape(11000, 4).tolist())
+    assert len(counts) == 11
+    assert min(counts.values()) > 800 and max(counts.values()) < 1200
+
+
+def test_bulk_seeds_are_reproducible():
+    assert (generate_boards(100, 4, seed=5) == generate_boards(100, 4, seed=5)).all()
+
+
+def test_bulk_fills_out_in_place():
+    out = np.zeros((50, 4, 4), dtype=np.uint8)
+    assert generate_boards(50, 4, seed=0, out=out) is out
+    assert (np.sort(out.reshape(50, 16), axis=1) == np.arange(16)).all()
+    with pytest.raises(ValueError, match="shape"):
+        generate_boards(40, 4, out=out)
+    with pytest.raises(ValueError, match="contiguous"):
+        generate_boards(25, 4, out=np.zeros((50, 4, 4), dtype=np.uint8)[::2])
@@ -0,0 +1,105 @@
+import random
+import time
+import pytest
+from utils import hints
+from utils.board import Board
+from utils.fast_solver import solve_fast
+from utils.generator import generate_board
+from utils.hints import HintService, greedy_move, zobrist_hash
+from utils.solver import solve
+
+
+def wait_for(condition, seconds=10):
+    deadline = time.monotonic() + seconds
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def service():
+    service = HintService(use_databases=False)
+    yield service
+    service.close()
+
+
+def test_hash_follows_moves(service):
+    board = generate_board(4, seed=1)
+    rng = random.Random(1)
+    service.update(board)
+    for _ in range(300):
+        previous_empty = board.move(rng.choice(board.valid_moves()))
+        service.update(board, previous_empty)
+        assert service._key == zobrist_hash(board)
+
+
+def test_greedy_move_lowers_the_distance():
+    board = Board(3, [1, 2, 3, 4, 5, 6, 7, 0, 8])
+    assert greedy_move(board) == 8
+    assert list(board.tiles) == [1, 2, 3, 4, 5, 6, 7, 0, 8]  # The board is left as it was
+
+
+def test_hints_follow_an_optimal_solution(service):
+    board = generate_board(3, seed=9)
+    length = len(solve(board.to_grid()))
+    service.start()
+    service.update(board)
+    wait_for(lambda: service.lookup(board) is not None)
+    assert service.lookup(board)[1:] == (length, True)
+    moves = 0
+    while not board.is_solved():
+        row, col = service.hint(board)  # Straight from the table: no new search is needed
+        previous_empty = board.move(board.index(row, col))
+        service.update(board, previous_empty)
+        moves += 1
+    assert moves == length
+    assert service.hint(board) is None
+
+
+def test_hint_before_the_search_is_greedy(service):
+    board = Board(3, [1, 2, 3, 4, 5, 6, 7, 0, 8])  # The worker is never started
+    service.update(board)
+    assert service.lookup(board) is None
+    assert service.hint(board) == (2, 2)
+
+
+def test_big_boards_get_fast_hints(service):
+    board = generate_board(hints.OPTIMAL_UP_TO + 2, seed=3)
+    service.start()
+    service.update(board)
+    wait_for(lambda: service.lookup(board) is not None)
+    assert service.lookup(board)[2] is False
+
+
+def test_optimal_entries_win_over_fast_ones(service):
+    board = generate_board(4, seed=0)
+    grid = board.to_grid()
+    optimal, fast = solve(grid), solve_fast(grid)
+    assert len(fast) > len(optimal)
+    service._store_path(board.copy(), fast, False)
+    assert service.lookup(board)[1:] == (len(fast), False)
+    service._store_path(board.copy(), optimal, True)
+    assert service.lookup(board)[1:] == (len(optimal), True)
+    service._store_path(board.copy(), fast, False)
+    assert service.lookup(board)[1:] == (len(optimal), True)
+
+
+def test_table_size_is_bounded():
+    service = HintService(table_size=10, use_databases=False)
+    board = generate_board(3, seed=5)
+    service._store_path(board.copy(), solve(board.to_grid()), True)
+    assert len(service._table) == 10
+
+
+def test_cancel_stops_the_search(monkeypatch, service):
+    monkeypatch.setattr(hints, "SEARCH_TIMEOUT", 60)
+    board = generate_board(4, seed=2)  # Takes far longer than this test without the databases
+    service.start()
+    service.update(board)
+    time.sleep(0.05)
+    service.cancel()
+    time.sleep(0.05)  # Let the worker notice
+    start = time.process_time()
+    time.sleep(0.3)
+    assert time.process_time() - start < 0.1  # Idle again
+    assert service.lookup(board) is None
@@ -0,0 +1,108 @@
+import os
+from utils.leaderboard import INDEX_HEADER, INDEX_MAGIC, LOG_HEADER, RECORD, VERSION, Leaderboard
+
+
+def add_scores(board, count, mode="classic", grid_size=3):
+    for i in range(count):
+        board.add_score(f"p{i}", 100 - i, 10.0 + i, mode, grid_size)
+
+
+def test_scores_survive_reopening(tmp_path):
+    board = Leaderboard(tmp_path, top_k=5, compact_every=4)
+    add_scores(board, 10)
+    add_scores(board, 3, mode="time_attack", grid_size=4)
+    expected = board.top_scores("classic", 3)
+    board.close()
+
+    reopened = Leaderboard(tmp_path, top_k=5, compact_every=4)
+    assert reopened.top_scores("classic", 3) == expected
+    assert [score["moves"] for score in expected] == [91, 92, 93, 94, 95]
+    assert len(reopened.top_scores("time_attack", 4)) == 3
+    reopened.close()
+
+
+def test_ranking_and_ties(tmp_path):
+    board = Leaderboard(tmp_path, top_k=3)
+    board.add_score("slow", 20, 30.0, "time_attack", 3)
+    board.add_score("fast", 40, 10.0, "time_attack", 3)
+    board.add_score("first", 30, 20.0, "classic", 3)
+    board.add_score("second", 30, 20.0, "classic", 3)
+    assert [score["name"] for score in board.top_scores("time_attack", 3)] == ["fast", "slow"]
+    assert [score["name"] for score in board.top_scores("classic", 3)] == ["first", "second"]
+    board.close()
+
+
+def test_index_plus_log_tail_is_replayed(tmp_path):
+    board = Leaderboard(tmp_path, top_k=5, compact_every=4)
+    add_scores(board, 6)  # Compacted after 4, two more only in the log
+    expected = board.top_scores("classic", 3)
+    board._log.close()  # Crash: no final compaction
+    board._log = None
+
+    reopened = Leaderboard(tmp_path, top_k=5, compact_every=4)
+    assert reopened.top_scores("classic", 3) == expected
+    reopened.close()
+
+
+def test_torn_log_record_is_dropped(tmp_path):
+    board = Leaderboard(tmp_path, compact_every=1000)
+    add_scores(board, 3)
+    board._log.write(b"\x00" * (RECORD.size // 2))  # Half a record, as if the game died mid-write
+    board._log.close()
+    board._log = None
+
+    reopened = Leaderboard(tmp_path)
+    assert len(reopened.top_scores("classic", 3)) == 3
+    reopened.add_score("after", 1, 1.0, "classic", 3)
+    reopened.close()
+    size = os.path.getsize(tmp_path / "scores.log")
+    assert (size - LOG_HEADER.size) % RECORD.size == 0
+    assert Leaderboard(tmp_path).top_scores("classic", 3)[0]["name"] == "after"
+
+
+def test_damaged_index_is_ignored(tmp_path):
+    board = Leaderboard(tmp_path, compact_every=2)
+    add_scores(board, 5)
+    expected = board.top_scores("classic", 3)
+    board.close()
+
+    for damaged in (b"xx", INDEX_HEADER.pack(INDEX_MAGIC, VERSION, 10, LOG_HEADER.size, 99), b"garbage" * 10):
+        (tmp_path / "scores.idx").write_bytes(damaged)
+        reopened = Leaderboard(tmp_path, compact_every=2)
+        assert reopened.top_scores("classic", 3) == expected
+        reopened._log.close()
+        reopened._log = None
+
+
+def test_ties_keep_their_order_after_reopening(tmp_path):
+    board = Leaderboard(tmp_path, top_k=5)
+    for name in "abcdef":
+        board.add_score(name, 10, 5.0)
+    assert [score["name"] for score in board.top_scores()] == list("abcde")
+    board.close()
+    assert [score["name"] for score in Leaderboard(tmp_path, top_k=5).top_scores()] == list("abcde")
+
+
+def test_record_with_a_bad_mode_is_skipped(tmp_path):
+    board = Leaderboard(tmp_path)
+    add_scores(board, 3)
+    board.close()
+    os.remove(tmp_path / "scores.idx")
+    with open(tmp_path / "scores.log", "r+b") as f:
+        f.seek(LOG_HEADER.size)
+        f.write(b"\x07")  # Mode byte of the first record
+
+    reopened = Leaderboard(tmp_path)
+    assert [score["name"] for score in reopened.top_scores()] == ["p2", "p1"]
+    assert reopened.add_score("after", 1, 1.0)
+    reopened.close()
+
+
+def test_foreign_log_is_moved_aside(tmp_path):
+    (tmp_path / "scores.log").write_bytes(b"not a scores log at all")
+    board = Leaderboard(tmp_path)
+    assert board.top_scores() == []
+    board.add_score("new", 5, 5.0)
+    board.close()
+    assert (tmp_path / "scores.log.bad").read_bytes() == b"not a scores log at all"
+    assert [score["name"] for score in Leaderboard(tmp_path).top_scores()] == ["new"]
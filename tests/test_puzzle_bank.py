@@ -0,0 +1,67 @@
+import json
+import time
+import pytest
+from utils.generator import generate_board
+from utils.puzzle_bank import DIFFICULTIES, PuzzleBank
+
+
+def fill(bank, size):
+    bank.start()
+    deadline = time.monotonic() + 30
+    while any(bank.available(size, band) < bank.capacity for band in DIFFICULTIES):
+        assert time.monotonic() < deadline, "bank did not fill"
+        time.sleep(0.01)
+
+
+def test_puzzles_match_their_seeds(tmp_path):
+    bank = PuzzleBank(path=str(tmp_path / "bank.json"), sizes=(4,), capacity=3)
+    fill(bank, 4)
+    for band in DIFFICULTIES:
+        for _ in range(3):
+            seed, board = bank.pop(4, band)
+            assert board == generate_board(4, seed=seed)  # What a replay of the game rebuilds
+    bank.close()
+
+
+def test_empty_queue_still_gives_a_puzzle(tmp_path):
+    bank = PuzzleBank(path=str(tmp_path / "bank.json"), sizes=(4,))
+    seed, board = bank.pop(6, "hard")  # A size the bank does not keep
+    assert board == generate_board(6, seed=seed)
+
+
+def test_bank_survives_a_restart(tmp_path):
+    path = str(tmp_path / "bank.json")
+    bank = PuzzleBank(path=path, sizes=(4,), capacity=3)
+    fill(bank, 4)
+    bank.close()
+    with open(path) as f:
+        saved = json.load(f)
+    reopened = PuzzleBank(path=path, sizes=(4,), capacity=3)
+    for band in DIFFICULTIES:
+        assert [reopened.pop(4, band)[0] for _ in range(3)] == saved["queues"][f"4:{band}"]
+    assert reopened._thresholds == {4: tuple(saved["thresholds"]["4"])}
+
+
+@pytest.mark.parametrize("content", [
+    "[1, 2, 3]",
+    '{"queues": [1, 2]}',
+    '{"queues": {"4:easy": [[12, "0102"], "x", true, -1, 5], "x:easy": [1], "4": [2], "4:medium": "abc"}}',
+    '{"thresholds": {"4": "ab", "x": [1, 2], "5": [1]}}',
+    "not json",
+])
+def test_damaged_file_is_ignored(tmp_path, content):
+    path = tmp_path / "bank.json"
+    path.write_text(content)
+    bank = PuzzleBank(path=str(path), sizes=(4,))
+    assert bank._thresholds == {}
+    for band in DIFFICULTIES:
+        seed, board = bank.pop(4, band)
+        assert board == generate_board(4, seed=seed)
+    if "4:easy" in content:
+        assert bank.available(4, "easy") == 0  # Only the one good seed (5) was kept, and it was just used
+
+
+def test_capacity_is_respected_when_loading(tmp_path):
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps({"queues": {"4:easy": list(range(20))}}))
+    assert PuzzleBank(path=str(path), sizes=(4,), capacity=4).available(4, "easy") == 4
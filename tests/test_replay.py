@@ -0,0 +1,68 @@
+import pytest
+from utils.generator import generate_board
+from utils.replay import HEADER, ReplayRecorder, decode_replay, play_replay, verify_submission
+from utils.solver import solve
+
+
+def record_solution(grid_size, seed, step=0.25):
+    board = generate_board(grid_size, seed=seed)
+    recorder = ReplayRecorder(grid_size, seed, start_time=100.0)
+    for number, (row, col) in enumerate(solve(board)):
+        previous_empty = board.move(board.index(row, col))
+        recorder.record(previous_empty, board.blank, when=100.0 + step * (number + 1))
+    return recorder, board
+
+
+def test_round_trip():
+    recorder, board = record_solution(3, seed=11)
+    grid_size, seed, directions, deltas = decode_replay(recorder.encode())
+    assert (grid_size, seed) == (3, 11)
+    assert len(directions) == len(deltas) == recorder.count
+    assert deltas == [250] * recorder.count
+    assert board.is_solved()
+
+
+def test_play_back_solves_the_board():
+    recorder, _ = record_solution(3, seed=5)
+    result = play_replay(recorder.encode())
+    assert result == {"valid": True, "solved": True, "moves": recorder.count, "time": recorder.count * 0.25}
+
+
+def test_verify_submission_checks_the_claims():
+    recorder, _ = record_solution(3, seed=7, step=0.1)
+    data = recorder.encode()
+    assert verify_submission((data, recorder.count, recorder.count * 0.1))["accepted"]
+    assert not verify_submission((data, recorder.count - 1, None))["accepted"]
+    assert not verify_submission((data, None, recorder.count * 0.1 + 5))["accepted"]
+
+
+def test_unfinished_replay_is_not_accepted():
+    board = generate_board(3, seed=3)
+    recorder = ReplayRecorder(3, 3, start_time=0.0)
+    index = board.valid_moves()[0]
+    previous_empty = board.move(index)
+    recorder.record(previous_empty, board.blank, when=1.0)
+    result = verify_submission((recorder.encode(), None, None))
+    assert result["valid"] and not result["solved"] and not result["accepted"]
+
+
+def test_illegal_move_is_reported():
+    recorder = ReplayRecorder(3, 1, start_time=0.0)
+    for number in range(3):
+        recorder.record(3, 0, when=number)  # The empty space goes up three times, so it must hit the top row
+    result = play_replay(recorder.encode())
+    assert not result["valid"] and result["moves"] < 3
+    assert result["error"] == f"Illegal move {result['moves'] + 1}"
+
+
+@pytest.mark.parametrize("cut", [0, 3, HEADER.size, HEADER.size + 1])
+def test_truncated_replay_is_rejected(cut):
+    recorder, _ = record_solution(3, seed=2)
+    result = play_replay(recorder.encode()[:cut])
+    assert not result["valid"] and result["moves"] == 0
+
+
+def test_other_files_are_rejected():
+    recorder, _ = record_solution(3, seed=2)
+    result = play_replay(b"XXXX" + recorder.encode()[4:])
+    assert not result["valid"] and result["error"] == "Not a replay"
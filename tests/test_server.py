@@ -0,0 +1,105 @@
+import asyncio
+import json
+import pytest
+from utils.generator import generate_board
+from utils.server import GameServer
+from utils.solver import solve
+
+
+def send(server, command, owned):
+    line = command if isinstance(command, bytes) else json.dumps(command).encode()
+    return json.loads(server.dispatch(line + b"\n", owned))
+
+
+def test_new_game_matches_its_seed():
+    server, owned = GameServer(), set()
+    state = send(server, {"op": "new", "size": 3, "seed": 7}, owned)
+    assert state["op"] == "state" and state["session"] in owned
+    assert state["tiles"] == list(generate_board(3, seed=7).tiles)
+    assert (state["moves"], state["solved"]) == (0, False)
+    assert send(server, {"op": "state", "session": state["session"]}, owned) == state
+
+
+def test_playing_a_game_to_the_end():
+    server, owned = GameServer(), set()
+    state = send(server, {"op": "new", "size": 3, "seed": 3}, owned)
+    session = state["session"]
+    tiles = state["tiles"]
+    solution = solve(generate_board(3, seed=3).to_grid())
+    for number, (row, col) in enumerate(solution, 1):
+        reply = send(server, {"op": "move", "session": session, "row": row, "col": col}, owned)
+        assert reply["op"] == "delta" and reply["moves"] == number
+        for index, tile in reply["set"]:
+            tiles[index] = tile
+    assert reply["solved"] and tiles == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    assert send(server, {"op": "move", "session": session, "row": 0, "col": 0}, owned)["error"] == \
+        "Puzzle is already solved"
+    closed = send(server, {"op": "close", "session": session}, owned)
+    assert closed["solved"] and closed["moves"] == len(solution) and closed["time"] is not None
+    assert session not in owned and server.stats["solved"] == 1
+
+
+@pytest.mark.parametrize("command, error", [
+    (b"not json", "Command is not valid JSON"),
+    (b"[" * 60000, "Command is not valid JSON"),
+    (b"[1, 2]", "Command must be a JSON object"),
+    ({"op": [1]}, "Unknown op [1]"),
+    ({"op": "jump"}, "Unknown op 'jump'"),
+    ({"op": "new", "size": 1}, "Size must be from 2 to 16"),
+    ({"op": "new", "size": True}, "Size must be from 2 to 16"),
+    ({"op": "new", "seed": -1}, "Seed must be an unsigned 64-bit integer"),
+    ({"op": "state", "session": 99}, "No session 99 on this connection"),
+])
+def test_bad_commands_get_an_error_reply(command, error):
+    server = GameServer()
+    assert send(server, command, set()) == {"op": "error", "error": error}
+
+
+@pytest.mark.parametrize("row, col", [(True, 0), (0, False), (3, 0), (0, -1), ("0", 0), (None, None)])
+def test_bad_moves_are_rejected(row, col):
+    server, owned = GameServer(), set()
+    session = send(server, {"op": "new", "size": 3, "seed": 1}, owned)["session"]
+    reply = send(server, {"op": "move", "session": session, "row": row, "col": col}, owned)
+    assert reply == {"op": "error", "error": "Move needs a row and col on the board"}
+    assert server.sessions[session].moves == 0
+
+
+def test_sessions_belong_to_their_connection():
+    server, mine, theirs = GameServer(), set(), set()
+    session = send(server, {"op": "new", "size": 3}, mine)["session"]
+    assert send(server, {"op": "state", "session": session}, theirs)["op"] == "error"
+    assert send(server, {"op": "close", "session": session}, theirs)["op"] == "error"
+
+
+def test_server_full():
+    server, owned = GameServer(max_sessions=2), set()
+    for _ in range(2):
+        send(server, {"op": "new"}, owned)
+    assert send(server, {"op": "new"}, owned) == {"op": "error", "error": "Server is full"}
+
+
+def test_over_a_socket(tmp_path):
+    async def run():
+        server = GameServer()
+        listening = asyncio.get_running_loop().create_future()
+        path = str(tmp_path / "server.sock")
+        task = asyncio.create_task(server.serve(unix_path=path, ready=listening.set_result))
+        await listening
+        reader, writer = await asyncio.open_unix_connection(path, limit=2 ** 20)
+        # Pipelined commands, including ones that must not drop the connection
+        writer.write(b'{"op":"new","size":4,"seed":5}\n' + b"[" * 60000 + b'\n{"op":[1]}\n{"op":"state","session":1}\n')
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in range(4)]
+        writer.close()
+        await writer.wait_closed()
+        for _ in range(100):  # The server drops the sessions once it sees the connection close
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        return server, replies
+
+    server, replies = asyncio.run(run())
+    assert [reply["op"] for reply in replies] == ["state", "error", "error", "state"]
+    assert replies[3]["tiles"] == replies[0]["tiles"]
+    assert server.sessions == {} and server.stats["connections"] == 1
@@ -0,0 +1,55 @@
+import random
+from itertools import permutations
+import numpy as np
+import pytest
+from utils.core import count_inversions, is_solvable
+from utils.solvability import count_flat_inversions, is_flat_solvable, is_solvable_batch
+
+
+def brute_force_inversions(tiles):
+    values = [tile for tile in tiles if tile]
+    return sum(1 for i in range(len(values)) for j in range(i + 1, len(values)) if values[i] > values[j])
+
+
+def test_inversions_match_brute_force():
+    rng = random.Random(0)
+    for cells in (4, 9, 16, 25, 64):
+        for _ in range(50):
+            tiles = list(range(cells))
+            rng.shuffle(tiles)
+            assert count_flat_inversions(tiles) == brute_force_inversions(tiles)
+    assert count_flat_inversions([]) == 0
+    assert count_flat_inversions([None, 3, 2, 1]) == 3
+
+
+def test_exactly_half_of_the_2x2_boards_are_solvable():
+    boards = [list(tiles) for tiles in permutations(range(4))]
+    solvable = [tiles for tiles in boards if is_flat_solvable(tiles, 2)]
+    assert len(solvable) == 12
+    assert [1, 2, 3, 0] in solvable and [2, 1, 3, 0] not in solvable
+
+
+def test_grid_helpers_agree_with_the_flat_ones():
+    grid = [[5, 6, 7], [4, 3, None], [8, 2, 1]]
+    tiles = [tile or 0 for row in grid for tile in row]
+    assert count_inversions(grid) == count_flat_inversions(tiles)
+    assert is_solvable(grid) == is_flat_solvable(tiles, 3)
+
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5])
+def test_batch_agrees_with_one_at_a_time(size):
+    rng = np.random.default_rng(size)
+    cells = size * size
+    boards = rng.permuted(np.broadcast_to(np.arange(cells, dtype=np.uint8), (500, cells)), axis=1)
+    expected = [is_flat_solvable(tiles, size) for tiles in boards.tolist()]
+    for chunk_size in (None, 1, 7):
+        mask = is_solvable_batch(boards.reshape(500, size, size), chunk_size=chunk_size)
+        assert mask.tolist() == expected
+    assert 0 < sum(expected) < 500
+
+
+def test_batch_needs_square_boards():
+    with pytest.raises(ValueError):
+        is_solvable_batch(np.zeros((3, 2, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        is_solvable_batch(np.zeros((3, 9), dtype=np.uint8))
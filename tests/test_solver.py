@@ -0,0 +1,102 @@
+import threading
+from collections import deque
+import pytest
+from utils.board import get_neighbours
+from utils.generator import generate_board
+from utils.pattern_db import build_pattern_databases, load_pattern_databases
+from utils.solver import SolverCancelled, SolverTimeout, UnsolvableError, solve
+
+
+@pytest.fixture(scope="module")
+def distances_3x3():
+    # Breadth-first search back from the solved board gives the true distance of every 3x3 board
+    neighbours = get_neighbours(3)
+    goal = bytes([1, 2, 3, 4, 5, 6, 7, 8, 0])
+    distances = {goal: 0}
+    queue = deque([(goal, 8)])
+    while queue:
+        tiles, blank = queue.popleft()
+        distance = distances[tiles] + 1
+        for pos in neighbours[blank]:
+            nxt = bytearray(tiles)
+            nxt[blank], nxt[pos] = nxt[pos], 0
+            nxt = bytes(nxt)
+            if nxt not in distances:
+                distances[nxt] = distance
+                queue.append((nxt, pos))
+    return distances
+
+
+def play(board, solution):
+    for row, col in solution:
+        assert board.move(board.index(row, col)) != -1
+    return board.is_solved()
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_solutions_are_optimal_on_3x3(distances_3x3, seed):
+    board = generate_board(3, seed=seed)
+    solution = solve(board.to_grid())
+    assert len(solution) == distances_3x3[bytes(board.tiles)]
+    assert play(board, solution)
+
+
+@pytest.fixture(scope="module")
+def database_3x3(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("pdb")
+    build_pattern_databases(3, directory=directory)
+    database = load_pattern_databases(3, directory=directory)
+    yield database
+    database.close()
+
+
+@pytest.mark.parametrize("partition", [None, ((1, 2, 4, 5), (3, 6, 7, 8))])
+def test_pattern_databases_keep_solutions_optimal(distances_3x3, tmp_path, partition):
+    # The second partition is not its own mirror image, so the mirrored lookups use different groups
+    build_pattern_databases(3, partition, directory=tmp_path)
+    database = load_pattern_databases(3, partition, directory=tmp_path)
+    try:
+        for seed in range(40):
+            board = generate_board(3, seed=seed)
+            solution = solve(board.to_grid(), database=database)
+            assert len(solution) == distances_3x3[bytes(board.tiles)]
+            assert play(board, solution)
+    finally:
+        database.close()
+
+
+def test_solved_board_needs_no_moves(database_3x3):
+    grid = [[1, 2, 3], [4, 5, 6], [7, 8, None]]
+    assert solve(grid) == []
+    assert solve(grid, database=database_3x3) == []
+
+
+def test_database_for_another_size_is_rejected(database_3x3):
+    with pytest.raises(ValueError):
+        solve(generate_board(4, seed=0).to_grid(), database=database_3x3)
+
+
+def test_timeout_and_cancel():
+    grid = generate_board(5, seed=0).to_grid()  # Far too hard to finish in time
+    with pytest.raises(SolverTimeout):
+        solve(grid, timeout=0.05)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(SolverCancelled):
+        solve(grid, cancel=cancel)
+
+
+def test_unsolvable_board():
+    with pytest.raises(UnsolvableError):
+        solve([[1, 2, 3], [4, 5, 6], [8, 7, None]])
+
+
+@pytest.mark.parametrize("grid", [
+    [[1, 1, 3], [4, 5, 6], [7, 8, None]],
+    [[1, 2, 3], [4, 5, 6], [7, 8, 9]],
+    [[1, 2], [3]],
+    [[None]],
+])
+def test_invalid_boards_are_rejected(grid):
+    with pytest.raises(ValueError, match="Board must"):
+        solve(grid)
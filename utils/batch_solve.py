@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+from utils.fast_solver import solve_fast
+from utils.hints import OPTIMAL_UP_TO
+from utils.pattern_db import load_pattern_databases
+from utils.solver import SolverTimeout, UnsolvableError, check_grid, solve
+
+# Streaming batch solver.
+#
+# Usage: python -m utils.batch_solve boards.jsonl [-o solutions.jsonl] [--timeout 10] [--fast-above 4]
+#
+# Reads one board per line in the nested-list shape generate_solved_grid() uses
+# (null for the empty space), solves them on a process pool and writes one JSON
+# line per board, in input order, as soon as it is ready:
+#   {"line": 1, "length": 22, "optimal": true, "moves": [[2, 1], ...], "seconds": 0.004}
+#   {"line": 2, "error": "timeout"}
+# At most --max-pending chunks are in flight, so memory stays flat however long
+# the input is, and reading pauses while the workers are busy. Because the
+# output is in input order, one board that never finishes would hold up the
+# whole stream, so every optimal search has a time limit and boards bigger than
+# --fast-above go to the fast (not optimal) solver instead.
+
+TIMEOUT = 10.0  # Seconds allowed per board
+
+_databases = {}  # Pattern databases per grid size, loaded once per worker
+_use_databases = True
+
+
+# Function to set up a worker process
+def _init_worker(use_databases):
+    global _use_databases
+    _use_databases = use_databases
+
+
+# Function to get the pattern databases for a grid size in this worker
+def _get_database(grid_size):
+    if not _use_databases:
+        return None
+    if grid_size not in _databases:
+        # Every worker maps the same files, so the pages are shared between them
+        _databases[grid_size] = load_pattern_databases(grid_size)
+    return _databases[grid_size]
+
+
+# Function to solve one input line and return its output record
+def solve_line(line_number, line, timeout, fast_above=OPTIMAL_UP_TO):
+    record = {"line": line_number}
+    try:
+        grid = json.loads(line)
+        check_grid(grid)  # Before the database lookup, which trusts the size
+        start = time.perf_counter()
+        optimal = len(grid) <= fast_above
+        if optimal:
+            solution = solve(grid, timeout=timeout, database=_get_database(len(grid)))
+        else:
+            solution = solve_fast(grid)
+        record["length"] = len(solution)
+        record["optimal"] = optimal
+        record["moves"] = [list(pos) for pos in solution]
+        record["seconds"] = round(time.perf_counter() - start, 6)
+    except SolverTimeout:
+        record["error"] = "timeout"
+    except UnsolvableError:
+        record["error"] = "unsolvable"
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        record["error"] = f"invalid board: {e}"
+    return record
+
+
+# Function to solve a chunk of (line number, line) pairs in a worker
+def solve_chunk(chunk, timeout, fast_above=OPTIMAL_UP_TO):
+    return [solve_line(line_number, line, timeout, fast_above) for line_number, line in chunk]
+
+
+# Function to group the non-blank input lines into numbered chunks
+def read_chunks(lines, chunk_size):
+    chunk = []
+    for line_number, line in enumerate(lines, 1):
+        if line.strip():
+            chunk.append((line_number, line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+# Function to stream boards through a process pool and write the solutions in order
+def batch_solve(lines, out, processes=None, timeout=TIMEOUT, chunk_size=8, max_pending=None, use_databases=True,
+                fast_above=OPTIMAL_UP_TO):
+    """Solve every board in lines, writing JSON lines to out. Returns summary stats."""
+    stats = {"boards": 0, "solved": 0, "timeouts": 0, "errors": 0}
+    start = time.perf_counter()
+    processes = processes or os.cpu_count() or 1
+    max_pending = max_pending or 4 * processes
+    with Pool(processes, initializer=_init_worker, initargs=(use_databases,)) as pool:
+        pending = deque()
+
+        def write_oldest():
+            for record in pending.popleft().get():
+                out.write(json.dumps(record) + "\n")
+                stats["boards"] += 1
+                if "moves" in record:
+                    stats["solved"] += 1
+                elif record["error"] == "timeout":
+                    stats["timeouts"] += 1
+                else:
+                    stats["errors"] += 1
+
+        for chunk in read_chunks(lines, chunk_size):
+            if len(pending) >= max_pending:
+                write_oldest()  # Backpressure: wait for the oldest chunk before reading more
+            pending.append(pool.apply_async(solve_chunk, (chunk, timeout, fast_above)))
+        while pending:
+            write_oldest()
+    stats["seconds"] = time.perf_counter() - start
+    stats["boards_per_sec"] = stats["boards"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a JSON-lines stream of slider puzzle boards")
+    parser.add_argument("input", nargs="?", default="-", help="input file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file, or - for stdout")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds allowed per board")
+    parser.add_argument("--fast-above", type=int, default=OPTIMAL_UP_TO,
+                        help="use the fast solver for boards bigger than this")
+    parser.add_argument("--chunk-size", type=int, default=8, help="boards sent to a worker at a time")
+    parser.add_argument("--max-pending", type=int, default=None, help="chunks in flight (default: 4 per worker)")
+    parser.add_argument("--no-pdb", action="store_true", help="do not use the pattern databases")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        summary = batch_solve(source, sink, args.processes, args.timeout, args.chunk_size, args.max_pending,
+                              not args.no_pdb, args.fast_above)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"{summary['boards']} boards ({summary['solved']} solved, {summary['timeouts']} timed out, "
+          f"{summary['errors']} errors) in {summary['seconds']:.2f}s, {summary['boards_per_sec']:.1f} boards/sec",
+          file=sys.stderr)
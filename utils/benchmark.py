@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from utils import headless
+from utils.generator import generate_board
+from utils.profiler import percentile, summarize_times
+
+# Benchmark suite for the game logic and rendering, run headless.
+#
+# Usage: python -m utils.benchmark [--sizes 3 4 5 16] [--out results.json]
+#
+# For each grid size it reports ops/sec for puzzle generation, moves and
+# completion checks, and p50/p99 frame times for a full board render, an
+# incremental (dirty-rect) render and a scripted session through main(). It
+# also times how long a fresh interpreter takes to reach the puzzle logic, the
+# main module and the menu window, next to the old start-up that initialised
+# every pygame subsystem and loaded the sounds on import. Results are written
+# as JSON so runs can be compared over time.
+
+RESULTS_DIR = "benchmark-results"
+
+
+# Function to time a callable run count times and return ops/sec
+def ops_per_second(func, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+# Function to benchmark one grid size
+def bench_grid_size(game, grid_size, count, frames):
+    import pygame
+
+    rng = random.Random(grid_size)
+    game.grid_size = grid_size
+    results = {}
+
+    results["generate_ops_per_sec"] = ops_per_second(lambda: generate_board(grid_size, rng=rng), count)
+
+    board = generate_board(grid_size, seed=grid_size)
+
+    def move():
+        index = rng.choice(board.valid_moves())
+        game.move_tile(board, board.position(index))
+
+    results["move_ops_per_sec"] = ops_per_second(move, count)
+    results["completion_check_ops_per_sec"] = ops_per_second(lambda: game.is_puzzle_completed(board), count)
+
+    # Full frame: redraw the whole board and flip
+    full_times = []
+    for i in range(frames):
+        start = time.perf_counter()
+        game.draw_game_board(board, i)
+        pygame.display.flip()
+        full_times.append(time.perf_counter() - start)
+    results["full_frame"] = summarize_times(full_times)
+
+    # Incremental frame: one move, redraw the dirty tiles and the status strip
+    incremental_times = []
+    for i in range(frames):
+        start = time.perf_counter()
+        index = rng.choice(board.valid_moves())
+        previous_empty = game.move_tile(board, board.position(index))
+        pygame.display.update(game.update_game_board(board, i, [previous_empty, board.blank], True))
+        incremental_times.append(time.perf_counter() - start)
+    results["incremental_frame"] = summarize_times(incremental_times)
+
+    # Scripted session through the real main() loop (only sizes with a menu button)
+    if grid_size in headless.GRID_SIZES:
+        session = headless.run_script([
+            headless.click_menu("Classic"),
+            headless.click_grid_size(grid_size),
+            headless.random_moves(frames, seed=grid_size),
+        ], game)
+        results["session_frame"] = summarize_times(session["frame_times"])
+    return results
+
+
+# Start-up steps timed in a fresh interpreter, from cheapest to the old eager start-up
+STARTUP_SCRIPTS = {
+    "core_import": "import utils.core",
+    "main_import": "import main",
+    "window_open": "import main; main.init_display()",
+    "eager_startup": "import main, pygame; pygame.init(); pygame.mixer.init(); main.init_display(); main.load_sounds()",
+}
+
+
+# Function to time each start-up step in fresh interpreters and return the median seconds
+def bench_startup(runs=5):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    results = {}
+    for name, script in STARTUP_SCRIPTS.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", script], env=env, check=True, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        results[name] = percentile(times, 50)
+    return results
+
+
+# Function to run the whole suite and return the results as a dict
+def run_benchmarks(sizes=headless.GRID_SIZES, count=20000, frames=300, startup_runs=5):
+    import pygame
+
+    game = headless.load_game()
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "count": count,
+        "frames": frames,
+        "startup_seconds": bench_startup(startup_runs),
+        "results": {f"{size}x{size}": bench_grid_size(game, size, count, frames) for size in sizes},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the slider puzzle headless")
+    parser.add_argument("--sizes", type=int, nargs="+", default=headless.GRID_SIZES)
+    parser.add_argument("--count", type=int, default=20000, help="calls per ops/sec measurement")
+    parser.add_argument("--frames", type=int, default=300, help="frames per frame-time measurement")
+    parser.add_argument("--startup-runs", type=int, default=5, help="fresh interpreters per start-up measurement")
+    parser.add_argument("--out", help="JSON file to write (default: benchmark-results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.count, args.frames, args.startup_runs)
+    print("start-up: " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in report["startup_seconds"].items()))
+    for size, result in report["results"].items():
+        print(f"{size}: generate {result['generate_ops_per_sec']:.0f}/s, "
+              f"move {result['move_ops_per_sec']:.0f}/s, "
+              f"check {result['completion_check_ops_per_sec']:.0f}/s, "
+              f"full frame p50 {result['full_frame']['p50_ms']:.2f} ms p99 {result['full_frame']['p99_ms']:.2f} ms"
+              + (f", session frame p50 {result['session_frame']['p50_ms']:.2f} ms "
+                 f"p99 {result['session_frame']['p99_ms']:.2f} ms" if "session_frame" in result else ""))
+
+    out = args.out or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {out}")
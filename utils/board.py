@@ -0,0 +1,232 @@
+from array import array
+
+# Compact board for the slider puzzle.
+#
+# Tiles live in one flat bytearray in row-major order with 0 for the empty space,
+# and the index of the empty space is cached so moves never have to scan the
+# board. The number of misplaced tiles and the total Manhattan distance to the
+# solved board are kept up to date on every move, so checking for completion is
+# just misplaced == 0. Indexing a Board like a list of lists (board[row][col], len(board),
+# iterating rows) still works and returns None for the empty space, so code
+# written for the grids from generate_solved_grid() keeps working unchanged.
+
+
+# Function to build the neighbour table for a grid size
+def _build_neighbours(grid_size):
+    n = grid_size
+    neighbours = []
+    for pos in range(n * n):
+        row, col = divmod(pos, n)
+        options = []
+        if row > 0:
+            options.append(pos - n)
+        if row < n - 1:
+            options.append(pos + n)
+        if col > 0:
+            options.append(pos - 1)
+        if col < n - 1:
+            options.append(pos + 1)
+        neighbours.append(tuple(options))
+    return tuple(neighbours)
+
+
+# Function to build the Manhattan distance table for a grid size
+def _build_distances(grid_size):
+    n = grid_size
+    cells = n * n
+    distances = [(0,) * cells]  # The empty space does not count
+    for tile in range(1, cells):
+        goal_row, goal_col = divmod(tile - 1, n)
+        distances.append(tuple(abs(pos // n - goal_row) + abs(pos % n - goal_col) for pos in range(cells)))
+    return tuple(distances)
+
+
+_NEIGHBOURS = {}
+_DISTANCES = {}
+
+
+# Function to get the (cached) neighbour table for a grid size
+def get_neighbours(grid_size):
+    neighbours = _NEIGHBOURS.get(grid_size)
+    if neighbours is None:
+        neighbours = _NEIGHBOURS[grid_size] = _build_neighbours(grid_size)
+    return neighbours
+
+
+# Function to get the (cached) distance table for a grid size, indexed [tile][position]
+def get_distances(grid_size):
+    distances = _DISTANCES.get(grid_size)
+    if distances is None:
+        distances = _DISTANCES[grid_size] = _build_distances(grid_size)
+    return distances
+
+
+class BoardRow:
+    """List-like view of one row of a Board."""
+
+    __slots__ = ("board", "start")
+
+    def __init__(self, board, start):
+        self.board = board
+        self.start = start
+
+    def __len__(self):
+        return self.board.size
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.board.size:
+            if -self.board.size <= col < 0:
+                col += self.board.size
+            else:
+                raise IndexError("row index out of range")
+        return self.board.tiles[self.start + col] or None
+
+    def __setitem__(self, col, value):
+        if not 0 <= col < self.board.size:
+            raise IndexError("row index out of range")
+        self.board.set_tile(self.start + col, value or 0)
+
+    def __iter__(self):
+        tiles = self.board.tiles
+        for pos in range(self.start, self.start + self.board.size):
+            yield tiles[pos] or None
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class Board:
+    """Slider puzzle board stored as a flat bytearray with a tracked empty space."""
+
+    __slots__ = ("size", "tiles", "blank", "neighbours", "distances", "misplaced", "distance")
+
+    def __init__(self, size, tiles=None):
+        self.size = size
+        if tiles is None:
+            tiles = list(range(1, size * size)) + [0]
+        self.tiles = bytearray(tiles)
+        if len(self.tiles) != size * size:
+            raise ValueError("Board needs exactly size * size tiles")
+        self.blank = self.tiles.index(0)
+        self.neighbours = get_neighbours(size)
+        self.distances = get_distances(size)
+        self.misplaced = sum(1 for pos, tile in enumerate(self.tiles) if tile and tile != pos + 1)
+        self.distance = sum(self.distances[tile][pos] for pos, tile in enumerate(self.tiles))
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Build a Board from a list-of-lists grid with None for the empty space."""
+        return cls(len(grid), [tile or 0 for row in grid for tile in row])
+
+    def to_grid(self):
+        """Return the board as a new list-of-lists grid with None for the empty space."""
+        n = self.size
+        return [[tile or None for tile in self.tiles[i * n:(i + 1) * n]] for i in range(n)]
+
+    def copy(self):
+        return Board(self.size, self.tiles)
+
+    def to_array(self):
+        """Return the tiles as an array('B'), sharing nothing with the board."""
+        return array("B", self.tiles)
+
+    # List-of-lists compatibility view
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.size:
+            if -self.size <= row < 0:
+                row += self.size
+            else:
+                raise IndexError("board index out of range")
+        return BoardRow(self, row * self.size)
+
+    def __iter__(self):
+        for row in range(self.size):
+            yield BoardRow(self, row * self.size)
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.size == other.size and self.tiles == other.tiles
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.size, bytes(self.tiles)))
+
+    def __repr__(self):
+        return f"Board({self.size}, {list(self.tiles)!r})"
+
+    # Position helpers
+    def index(self, row, col):
+        return row * self.size + col
+
+    def position(self, index):
+        return divmod(index, self.size)
+
+    def empty_position(self):
+        return divmod(self.blank, self.size)
+
+    def is_adjacent(self, index):
+        """Return True if the tile at index is next to the empty space."""
+        return self.blank >= 0 and index in self.neighbours[self.blank]
+
+    def valid_moves(self):
+        """Return the indexes of the tiles that can slide into the empty space."""
+        return self.neighbours[self.blank] if self.blank >= 0 else ()
+
+    # Moves
+    def set_tile(self, index, tile):
+        """Put a tile (0 for the empty space) at index, keeping the counters in step."""
+        tiles = self.tiles
+        old = tiles[index]
+        if old:
+            self.misplaced -= old != index + 1
+            self.distance -= self.distances[old][index]
+        if tile:
+            self.misplaced += tile != index + 1
+            self.distance += self.distances[tile][index]
+        else:
+            self.blank = index
+        tiles[index] = tile
+        if tile and index == self.blank:
+            # The empty space was written over; -1 until one is put back, e.g. halfway through a swap
+            self.blank = tiles.find(0)
+
+    def move(self, index):
+        """Slide the tile at index into the empty space.
+
+        Returns the previous index of the empty space (pass it to undo() to take
+        the move back), or -1 if the tile is not next to the empty space.
+        """
+        blank = self.blank
+        if blank < 0 or index not in self.neighbours[blank]:
+            return -1
+        tiles = self.tiles
+        tile = tiles[index]
+        tiles[blank] = tile
+        tiles[index] = 0
+        self.blank = index
+        self._moved(tile, index, blank)
+        return blank
+
+    def undo(self, previous_blank):
+        """Take back a move made with move()."""
+        tiles = self.tiles
+        blank = self.blank
+        tile = tiles[previous_blank]
+        tiles[blank] = tile
+        tiles[previous_blank] = 0
+        self.blank = previous_blank
+        self._moved(tile, previous_blank, blank)
+
+    def _moved(self, tile, src, dst):
+        # O(1) update of the counters after tile slid from src to dst
+        self.distance += self.distances[tile][dst] - self.distances[tile][src]
+        self.misplaced += (tile == src + 1) - (tile == dst + 1)
+
+    def is_solved(self):
+        return self.misplaced == 0
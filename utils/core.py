@@ -0,0 +1,92 @@
+import random
+from utils.board import Board
+from utils.generator import generate_board
+from utils.solvability import count_flat_inversions
+
+# Puzzle logic shared by the game and the tools.
+#
+# Nothing here imports pygame, so scripts, tests and pool workers can check,
+# shuffle and generate boards without paying for SDL startup. main.py imports
+# these functions, so they are still reachable as main.count_inversions etc.
+
+
+# Function to count the number of inversions in the grid
+def count_inversions(grid):
+    """Count the number of inversions in the grid."""
+    return count_flat_inversions([tile for row in grid for tile in row])
+
+# Function to check if the puzzle is solvable
+def is_solvable(grid):
+    """Check if the grid is solvable."""
+    inversions = count_inversions(grid)
+    empty_pos = find_empty_tile(grid)
+    grid_size = len(grid)
+    
+    if grid_size % 2 == 1:  # Odd grid size
+        return inversions % 2 == 0
+    else:  # Even grid size
+        # Blank is on an even row from the bottom (counting from 1)
+        empty_row_from_bottom = grid_size - empty_pos[0]
+        if empty_row_from_bottom % 2 == 0:
+            return inversions % 2 == 1
+        else:
+            return inversions % 2 == 0
+
+# Function to shuffle the grid using valid moves (always solvable, since every step is a legal move)
+def shuffle_grid(grid, moves=100):
+    empty_pos = find_empty_tile(grid)
+    
+    for _ in range(moves):
+        valid_moves = get_valid_moves(grid, empty_pos)
+        next_move = random.choice(valid_moves)
+
+        # Swap the empty tile with the selected valid move
+        grid[empty_pos[0]][empty_pos[1]], grid[next_move[0]][next_move[1]] = \
+            grid[next_move[0]][next_move[1]], grid[empty_pos[0]][empty_pos[1]]
+        empty_pos = next_move  # Update the empty tile position
+    return grid
+
+# Function to generate a solved grid
+def generate_solved_grid(grid_size):
+    grid = list(range(1, grid_size * grid_size)) + [None]  # None represents the empty space
+    grid_2d = [grid[i * grid_size:(i + 1) * grid_size] for i in range(grid_size)]
+    return grid_2d
+
+# Function to find the position of the empty tile (None)
+def find_empty_tile(grid):
+    for i in range(len(grid)):
+        for j in range(len(grid[i])):
+            if grid[i][j] is None:
+                return i, j
+
+# Function to get the valid moves for the empty tile (None)
+def get_valid_moves(grid, empty_pos):
+    valid_moves = []
+    x, y = empty_pos
+    if x > 0:  # Can move up
+        valid_moves.append((x - 1, y))
+    if x < len(grid) - 1:  # Can move down
+        valid_moves.append((x + 1, y))
+    if y > 0:  # Can move left
+        valid_moves.append((x, y - 1))
+    if y < len(grid[0]) - 1:  # Can move right
+        valid_moves.append((x, y + 1))
+    return valid_moves
+
+# Function to slide the tile at (row, col) into the empty space
+def slide_tile(grid, pos):
+    # The board tracks the empty space, so this is a single O(1) swap
+    return grid.move(grid.index(pos[0], pos[1]))  # Previous empty index, or -1 if the tile could not move
+
+# Function to check if the puzzle is completed
+def is_puzzle_completed(grid):
+    if isinstance(grid, Board):
+        return grid.misplaced == 0  # Kept up to date by every move, so no scan is needed
+    # A list-of-lists grid like the ones from generate_solved_grid()
+    flat = [tile for row in grid for tile in row]
+    return flat == list(range(1, len(flat))) + [None]
+
+# Function to initialize a shuffled grid based on selected size
+def init_grid(grid_size, seed=None):
+    # Draw uniformly from all solvable boards (pass a seed for a reproducible puzzle)
+    return generate_board(grid_size, seed=seed)
@@ -0,0 +1,300 @@
+import argparse
+import heapq
+import math
+import random
+import time
+from collections import deque
+from utils.board import get_neighbours
+from utils.pattern_db import load_pattern_databases
+from utils.solvability import is_flat_solvable
+from utils.solver import UnsolvableError, check_grid, linear_conflict_distance, solve
+
+# Fast suboptimal solver for big boards.
+#
+# Optimal search is out of reach past 5x5, so this solves the board the way a
+# person would: finish the top row or the left column of the unsolved region,
+# lock it, and repeat until only the bottom-right 3x3 is left, which IDA* then
+# solves optimally in a few milliseconds (faster still with the 3x3 pattern
+# databases). Each tile is moved into place by a weighted best-first search over
+# (tile position, blank position) that never touches locked cells, so memory is
+# bounded by cells^2 states. The last two tiles of a line go in with the usual
+# trick of parking them one behind the other and rotating them in.
+#
+# The order of rows and columns changes the result, so within the time budget
+# the solver tries several orders and keeps the shortest solution. The first
+# order always runs to the end, so there is always an answer. Moves that are
+# undone straight away are cancelled before the length is compared.
+
+TIME_BUDGET = 0.05  # Seconds spent looking for shorter solutions
+STEP_COST = 5  # Rough number of moves per step of a tile, used to guide the tile search
+
+_finish_database = False  # 3x3 pattern databases for the last region, loaded on first use (None if not built)
+
+
+# Function to get the 3x3 pattern databases, if they have been built
+def _get_finish_database():
+    global _finish_database
+    if _finish_database is False:
+        _finish_database = load_pattern_databases(3)
+    return _finish_database
+
+
+# Function to move the blank to target without touching locked cells, returning the blank's path
+def _route_blank(blank, target, locked, neighbours):
+    if blank == target:
+        return []
+    parent = {blank: None}
+    queue = deque([blank])
+    while queue:
+        pos = queue.popleft()
+        for nxt in neighbours[pos]:
+            if locked[nxt] or nxt in parent:
+                continue
+            parent[nxt] = pos
+            if nxt == target:
+                path = []
+                while nxt != blank:
+                    path.append(nxt)
+                    nxt = parent[nxt]
+                return path[::-1]
+            queue.append(nxt)
+    raise RuntimeError("Blank cannot reach its target")
+
+
+# Function to move one tile from start to target, returning the blank's path
+def _route_tile(start, blank, target, locked, neighbours, grid_size):
+    if start == target:
+        return []
+    n = grid_size
+    cells = n * n
+    target_row, target_col = divmod(target, n)
+
+    def estimate(tile, pos):
+        # Each step of the tile costs about five moves once the blank is next to it, so this
+        # steers the search straight at the target without having to be exact
+        tile_row, tile_col = divmod(tile, n)
+        blank_row, blank_col = divmod(pos, n)
+        return (STEP_COST * (abs(tile_row - target_row) + abs(tile_col - target_col))
+                + abs(tile_row - blank_row) + abs(tile_col - blank_col))
+
+    # States are tile position * cells + blank position, searched best first
+    first = start * cells + blank
+    parent = {first: None}
+    cost = {first: 0}
+    heap = [(estimate(start, blank), first)]
+    while heap:
+        _, state = heapq.heappop(heap)
+        tile, pos = divmod(state, cells)
+        g = cost[state] + 1
+        for nxt in neighbours[pos]:
+            if locked[nxt]:
+                continue
+            moved = pos if nxt == tile else tile  # Moving the blank onto the tile slides the tile back
+            new_state = moved * cells + nxt
+            if new_state in cost and cost[new_state] <= g:
+                continue
+            parent[new_state] = state
+            cost[new_state] = g
+            if moved == target:
+                path = []
+                while new_state != first:
+                    path.append(new_state % cells)
+                    new_state = parent[new_state]
+                return path[::-1]
+            heapq.heappush(heap, (g + estimate(moved, nxt), new_state))
+    raise RuntimeError("Tile cannot reach its target")
+
+
+class _Reduction:
+    # One run of the row/column reduction on a copy of the board.
+
+    def __init__(self, tiles, grid_size):
+        self.n = grid_size
+        self.cells = grid_size * grid_size
+        self.tiles = list(tiles)
+        self.where = [0] * self.cells  # Tile -> position
+        for pos, tile in enumerate(self.tiles):
+            self.where[tile] = pos
+        self.locked = bytearray(self.cells)
+        self.neighbours = get_neighbours(grid_size)
+        self.path = []  # Blank positions, i.e. the cells to click
+
+    def play(self, path):
+        tiles, where = self.tiles, self.where
+        blank = where[0]
+        for pos in path:
+            tile = tiles[pos]
+            tiles[blank] = tile
+            where[tile] = blank
+            blank = pos
+        tiles[blank] = 0
+        where[0] = blank
+        self.path += path
+
+    def place(self, tile, target):
+        self.play(_route_tile(self.where[tile], self.where[0], target, self.locked, self.neighbours, self.n))
+
+    def blank_to(self, target):
+        self.play(_route_blank(self.where[0], target, self.locked, self.neighbours))
+
+    def line(self, cells):
+        """Solve the given cells of a row or column (in goal order) and lock them."""
+        locked = self.locked
+        for pos in cells[:-2]:
+            self.place(pos + 1, pos)
+            locked[pos] = 1
+        second_last, last = cells[-2], cells[-1]
+        if self.tiles[second_last] == second_last + 1 and self.tiles[last] == last + 1:
+            locked[second_last] = locked[last] = 1
+            return
+        # Park the last tile in the second last cell and the second last tile just past it, then rotate both in
+        inward = self._inward(cells)
+        below = second_last + inward
+        self.place(last + 1, second_last)
+        locked[second_last] = 1
+        try:
+            self.place(second_last + 1, below)
+        except RuntimeError:
+            # The tile is shut in the corner behind the parked one, so move it well clear and park again
+            locked[second_last] = 0
+            clear = second_last + 2 * inward
+            self.place(second_last + 1, clear)
+            locked[clear] = 1
+            self.place(last + 1, second_last)
+            locked[clear] = 0
+            locked[second_last] = 1
+            self.place(second_last + 1, below)
+        locked[below] = 1
+        self.blank_to(last)
+        locked[second_last] = locked[below] = 0
+        self.play([second_last, below])
+        locked[second_last] = locked[last] = 1
+
+    def _inward(self, cells):
+        # Offset from a cell of the line to its neighbour inside the unsolved region
+        return self.n if cells[1] - cells[0] == 1 else 1
+
+    def finish(self):
+        """Solve the bottom-right 3x3 (or smaller) region optimally."""
+        n, size = self.n, min(self.n, 3)
+        offset = n - size
+        region = []
+        for row in range(offset, n):
+            region_row = []
+            for col in range(offset, n):
+                tile = self.tiles[row * n + col]
+                if tile:
+                    goal_row, goal_col = divmod(tile - 1, n)
+                    tile = (goal_row - offset) * size + (goal_col - offset) + 1
+                region_row.append(tile or None)
+            region.append(region_row)
+        database = _get_finish_database() if size == 3 else None
+        self.play([(row + offset) * n + col + offset for row, col in solve(region, database=database)])
+
+
+# Function to cancel moves that are undone straight away
+def _cancel_reversals(blank, path):
+    trail = [blank]
+    for pos in path:
+        if len(trail) > 1 and trail[-2] == pos:
+            trail.pop()
+        else:
+            trail.append(pos)
+    return trail[1:]
+
+
+# Function to run the reduction once with a given order ("r" for a row, "c" for a column per step)
+def _reduce(tiles, grid_size, order):
+    n = grid_size
+    reduction = _Reduction(tiles, n)
+    top = left = 0
+    for step in order:
+        if step == "r":
+            reduction.line([top * n + col for col in range(left, n)])
+            top += 1
+        else:
+            reduction.line([row * n + left for row in range(top, n)])
+            left += 1
+    reduction.finish()
+    return _cancel_reversals(tiles.index(0), reduction.path)
+
+
+# Function to list the orders to try: the simple ones first, then random interleavings
+def _orders(grid_size, rng):
+    steps = max(0, grid_size - 3)
+    yield "rc" * steps
+    yield "cr" * steps
+    yield "r" * steps + "c" * steps
+    yield "c" * steps + "r" * steps
+    while True:
+        order = list("r" * steps + "c" * steps)
+        rng.shuffle(order)
+        yield "".join(order)
+
+
+# Function to solve a grid quickly and report how close the solution is to the lower bound
+def solve_fast_report(grid, time_budget=TIME_BUDGET, seed=0):
+    """Return a dict with "moves" ((row, col) positions to click), "length",
+    "lower_bound" (Manhattan distance + linear conflict), "ratio" (length over
+    the lower bound), "attempts" and "seconds".
+
+    Tries reduction orders until time_budget seconds have passed, keeping the
+    shortest solution; the first order always finishes, however small the
+    budget. Raises ValueError if the grid is not a valid board and
+    UnsolvableError if it cannot be solved.
+    """
+    start = time.perf_counter()
+    n = len(grid)
+    tiles = check_grid(grid)
+    if not is_flat_solvable(tiles, n):
+        raise UnsolvableError("Grid is not solvable")
+
+    best = None
+    tried = set()
+    steps = max(0, n - 3)
+    for order in _orders(n, random.Random(seed)):
+        if order in tried:
+            continue
+        tried.add(order)
+        path = _reduce(tiles, n, order)
+        if best is None or len(path) < len(best):
+            best = path
+        if time.perf_counter() - start >= time_budget or len(tried) == math.comb(2 * steps, steps):
+            break
+
+    lower_bound = linear_conflict_distance(grid)
+    return {
+        "moves": [divmod(pos, n) for pos in best],
+        "length": len(best),
+        "lower_bound": lower_bound,
+        "ratio": len(best) / lower_bound if lower_bound else 1.0,
+        "attempts": len(tried),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# Function to solve a grid quickly (not necessarily in the fewest moves)
+def solve_fast(grid, time_budget=TIME_BUDGET, seed=0):
+    """Return a list of (row, col) tile positions that solves the grid, like solve()."""
+    return solve_fast_report(grid, time_budget, seed)["moves"]
+
+
+if __name__ == "__main__":
+    from utils.generator import generate_board
+
+    parser = argparse.ArgumentParser(description="Measure the fast solver on random boards")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6, 7, 8])
+    parser.add_argument("--count", type=int, default=20, help="boards per size")
+    parser.add_argument("--budget", type=float, default=TIME_BUDGET, help="seconds per board")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        reports = [solve_fast_report(generate_board(size, seed=i).to_grid(), args.budget) for i in range(args.count)]
+        first = [solve_fast_report(generate_board(size, seed=i).to_grid(), 0) for i in range(args.count)]
+        print(f"{size}x{size}: {sum(r['length'] for r in reports) / len(reports):.0f} moves "
+              f"(lower bound {sum(r['lower_bound'] for r in reports) / len(reports):.0f}, "
+              f"{sum(r['ratio'] for r in reports) / len(reports):.2f}x), "
+              f"{sum(r['attempts'] for r in reports) / len(reports):.0f} orders in "
+              f"{sum(r['seconds'] for r in reports) / len(reports) * 1000:.0f} ms; "
+              f"first order alone {sum(r['length'] for r in first) / len(first):.0f} moves in "
+              f"{max(r['seconds'] for r in first) * 1000:.1f} ms worst case")
@@ -0,0 +1,76 @@
+import random
+from utils.board import Board
+from utils.solvability import is_flat_solvable, is_solvable_batch
+
+# Puzzle generation.
+#
+# Every generated board is drawn uniformly from the solvable boards: the tiles and
+# the empty space are shuffled once, and if the result has the wrong parity
+# tiles 1 and 2 are swapped. That swap flips the inversion parity without moving
+# the empty space, so it pairs every unsolvable board with exactly one solvable
+# board and the distribution stays uniform.
+
+
+# Function to generate one random solvable board
+def generate_board(grid_size, seed=None, rng=None):
+    """Return a random solvable, unsolved Board.
+
+    Pass seed for a reproducible puzzle, or rng (a random.Random) to draw
+    several puzzles from one stream.
+    """
+    if rng is None:
+        rng = random.Random(seed)
+    cells = grid_size * grid_size
+    tiles = list(range(cells))
+    while True:
+        rng.shuffle(tiles)
+        if not is_flat_solvable(tiles, grid_size):
+            one, two = tiles.index(1), tiles.index(2)
+            tiles[one], tiles[two] = 2, 1
+        board = Board(grid_size, tiles)
+        if not board.is_solved():
+            return board
+
+
+# Function to generate many random solvable boards at once
+def generate_boards(count, grid_size, seed=None, out=None, chunk_size=65536):
+    """Fill an (count, n, n) uint8 NumPy array with random solvable, unsolved boards.
+
+    out may be a preallocated C-contiguous array of that shape; it is filled in
+    place and returned. 0 marks the empty space. Boards are generated chunk_size at a time
+    so memory use does not grow with count.
+    """
+    import numpy as np
+
+    cells = grid_size * grid_size
+    if out is None:
+        out = np.empty((count, grid_size, grid_size), dtype=np.uint8)
+    elif out.shape != (count, grid_size, grid_size):
+        raise ValueError("out must have shape (count, grid_size, grid_size)")
+    elif not out.flags.c_contiguous:
+        raise ValueError("out must be C-contiguous so it can be filled in place")
+    rng = np.random.default_rng(seed)
+    flat_out = out.reshape(count, cells)  # A view, since out is contiguous
+    order = np.arange(cells, dtype=out.dtype)
+    solved = np.roll(order, -1)  # 1, 2, ..., cells - 1, 0
+
+    def draw(size):
+        chunk = rng.permuted(np.broadcast_to(order, (size, cells)), axis=1)
+        # Swap tiles 1 and 2 on every board with the wrong parity
+        wrong = np.flatnonzero(~is_solvable_batch(chunk.reshape(size, grid_size, grid_size)))
+        one = np.argmax(chunk[wrong] == 1, axis=1)
+        two = np.argmax(chunk[wrong] == 2, axis=1)
+        chunk[wrong, one] = 2
+        chunk[wrong, two] = 1
+        return chunk
+
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        chunk = draw(size)
+        # Draw the solved board again, like generate_board() does; this keeps the rest uniform
+        redo = np.flatnonzero((chunk == solved).all(axis=1))
+        while redo.size:
+            chunk[redo] = draw(redo.size)
+            redo = redo[(chunk[redo] == solved).all(axis=1)]
+        flat_out[start:start + size] = chunk
+    return out
@@ -0,0 +1,183 @@
+import os
+import tempfile
+import time
+from collections import deque
+from importlib import import_module
+from utils.hints import HintService
+from utils.leaderboard import Leaderboard
+from utils.puzzle_bank import PuzzleBank
+
+# Headless driver for the game.
+#
+# load_game() imports main.py and opens its window on SDL's dummy video and
+# audio drivers, and run_script() plays a scripted stream of clicks through the
+# real main() loop, one event per frame, with every frame drawn and timed. A
+# script is a list of pygame events and/or callables that take the game module
+# and return a list of events; the callables run when they are reached, so they
+# can look at the board as it is at that point (see click_tile(), random_moves()
+# and solve_moves()). Scores and replays from scripted games go to a temporary
+# directory that is removed afterwards, never to the player's own files.
+
+# Layout of the screens in main.py, used to turn labels into click positions
+MENU_BUTTONS = ["Classic", "Time Attack", "Leaderboard", "Sound", "How to Play"]
+GRID_SIZES = [3, 4, 5, 6, 7, 8]
+SOLVE_TIMEOUT = 5.0  # Seconds of optimal search in solve_moves() before it settles for the fast solver
+
+
+class _NoClock:
+    # Stands in for pygame.time.Clock so scripted runs are not capped at 30 FPS
+    def tick(self, framerate=0):
+        return 0
+
+
+# Function to import main.py without a real window or sound device
+def load_game():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    game = import_module("main")
+    game.init_display()  # So the draw functions can be called before main()
+    return game
+
+
+class ScriptedScheduler:
+    """Drop-in for FrameScheduler that feeds main() one scripted event per frame."""
+
+    def __init__(self, game, actions):
+        self.game = game
+        self.actions = iter(actions)
+        self.pending = deque()
+        self.dirty = True
+        self.frame_times = []
+        self._frame_start = time.perf_counter()
+
+    def invalidate(self):
+        self.dirty = True
+
+    def schedule(self, delay):
+        pass  # Every scripted frame is drawn anyway
+
+    def animate(self):
+        self.dirty = True
+
+    def frame_drawn(self):
+        self.frame_times.append(time.perf_counter() - self._frame_start)
+
+    def wait(self):
+        import pygame
+
+        while not self.pending:
+            action = next(self.actions, None)
+            if action is None:
+                return [pygame.event.Event(pygame.QUIT)]
+            self.pending.extend(action(self.game) if callable(action) else [action])
+        self.dirty = True
+        self._frame_start = time.perf_counter()
+        return [self.pending.popleft()]
+
+
+# Function to make a key press event
+def press(key):
+    import pygame
+
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="")
+
+
+# Function to make a left click event at a screen position
+def click(x, y):
+    import pygame
+
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=1)
+
+
+# Function to click a main menu button
+def click_menu(label):
+    return click(200, 150 + MENU_BUTTONS.index(label) * 90 + 30)
+
+
+# Function to click a grid size on the grid selection screen
+def click_grid_size(size):
+    return click(200, 150 + GRID_SIZES.index(size) * 80 + 30)
+
+
+# Function to click the back button on the game screen
+def click_back():
+    return click(40, 80)
+
+
+# Function to click a button on the completion screen ("Back to Menu" or "Play Again")
+def click_completion(label):
+    return click(200, 425 if label == "Back to Menu" else 495)
+
+
+# Function to click a board tile; the click position depends on the grid size at that point
+def click_tile(row, col):
+    def action(game):
+        tile_size = game.SCREEN_WIDTH // game.grid_size
+        return [click(col * tile_size + tile_size // 2, 100 + row * tile_size + tile_size // 2)]
+    return action
+
+
+# Function to play random legal moves on whatever board is in play at that point
+def random_moves(count, seed=None):
+    import random
+
+    def action(game):
+        rng = random.Random(seed)
+        board = game.grid.copy()
+        events = []
+        for _ in range(count):
+            index = rng.choice(board.valid_moves())
+            board.move(index)
+            events.extend(click_tile(*board.position(index))(game))
+        return events
+    return action
+
+
+# Function to play the solver's solution for the board in play at that point
+def solve_moves(timeout=SOLVE_TIMEOUT):
+    from utils.fast_solver import solve_fast
+    from utils.hints import OPTIMAL_UP_TO
+    from utils.solver import SolverTimeout, solve
+
+    def action(game):
+        if game.grid_size > OPTIMAL_UP_TO:
+            solution = solve_fast(game.grid)  # Optimal search would never finish
+        else:
+            try:
+                solution = solve(game.grid, timeout=timeout)
+            except SolverTimeout:
+                solution = solve_fast(game.grid)  # The hardest 4x4 boards can take minutes
+        return [event for pos in solution for event in click_tile(*pos)(game)]
+    return action
+
+
+# Function to play a script through main() and report what happened
+def run_script(actions, game=None):
+    """Run main() on a script of events and return a summary of the session."""
+    game = game or load_game()
+    game.clock = _NoClock()
+    if game.puzzle_bank is None:
+        # A bank that is never started or saved: every puzzle is generated on the spot
+        game.puzzle_bank = PuzzleBank(path=os.devnull)
+    if game.hint_service is None:
+        game.hint_service = HintService()  # Never started, so hints are always the greedy fallback
+    game.current_screen = game.MENU
+    game.moves = 0
+    scheduler = ScriptedScheduler(game, actions)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as scratch:
+        game.leaderboard = Leaderboard(scratch)
+        replay_dir, game.replay_dir = game.replay_dir, os.path.join(scratch, "replays")
+        try:
+            game.main(scheduler=scheduler)
+        finally:
+            game.leaderboard.close()
+            game.leaderboard = None
+            game.replay_dir = replay_dir
+    return {
+        "screen": game.current_screen,
+        "moves": game.moves,
+        "frames": len(scheduler.frame_times),
+        "frame_times": scheduler.frame_times,
+        "seconds": time.perf_counter() - start,
+    }
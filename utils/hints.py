@@ -0,0 +1,206 @@
+import random
+import threading
+from collections import OrderedDict
+from utils.board import Board
+from utils.fast_solver import solve_fast
+from utils.pattern_db import load_pattern_databases
+from utils.solver import SolverCancelled, SolverTimeout, UnsolvableError, solve
+
+# Hint service.
+#
+# Searches for the optimal solution on a background thread so the game loop
+# never waits on the solver. Each time the player moves, update() cancels the
+# search for the old board and starts one for the new board. Every solution
+# found is stored in a transposition table, one entry per board along the
+# path, keyed by a Zobrist hash of the board and evicted least recently used
+# first. The game passes the move it just made to update(), so the hash is
+# brought up to date with two XORs instead of rehashing the whole board. A
+# player who follows the hints, or steps off the path and comes back, gets the
+# next hint from the table straight away. Until the search for a new board
+# finishes, hint() falls back to the move that lowers the Manhattan distance
+# most, so a hint is always ready within the frame.
+#
+# Past OPTIMAL_UP_TO the optimal search would never finish, so the worker uses
+# the fast row/column reduction solver instead. Those hints follow a solution
+# that is a few times longer than the shortest one, but they arrive within a
+# frame or two. The optimal search is also given only SEARCH_TIMEOUT seconds
+# before the worker falls back to the fast solver, so a hard board never keeps
+# a core busy while the player is thinking. cancel() stops the search when the
+# player leaves the game. Table entries say whether they come from an optimal
+# solution; an optimal entry is never replaced by a fast one, and always
+# replaces a fast one.
+
+TABLE_SIZE = 200000
+OPTIMAL_UP_TO = 4  # Largest grid size searched optimally
+SEARCH_TIMEOUT = 0.3  # Seconds of optimal search before falling back to the fast solver
+
+_ZOBRIST = {}
+
+
+# Function to get the (cached) Zobrist keys for a grid size, indexed [tile][position]
+def get_zobrist_keys(grid_size):
+    keys = _ZOBRIST.get(grid_size)
+    if keys is None:
+        rng = random.Random(grid_size)  # Fixed seed, so hashes are the same in every run
+        cells = grid_size * grid_size
+        keys = _ZOBRIST[grid_size] = tuple(tuple(rng.getrandbits(64) for _ in range(cells)) for _ in range(cells))
+    return keys
+
+
+# Function to compute the Zobrist hash of a board
+def zobrist_hash(board):
+    keys = get_zobrist_keys(board.size)
+    value = board.size
+    for pos, tile in enumerate(board.tiles):
+        if tile:
+            value ^= keys[tile][pos]
+    return value
+
+
+# Function to pick the move that lowers the Manhattan distance the most
+def greedy_move(board):
+    best_index, best_value = None, None
+    for index in board.valid_moves():
+        previous_empty = board.move(index)
+        value = board.distance  # Kept up to date by the move itself
+        board.undo(previous_empty)
+        if best_value is None or value < best_value:
+            best_index, best_value = index, value
+    return best_index
+
+
+class HintService:
+    """Background optimal-move search with a Zobrist-keyed LRU transposition table."""
+
+    def __init__(self, table_size=TABLE_SIZE, use_databases=True):
+        self.table_size = table_size
+        self.use_databases = use_databases
+        self._table = OrderedDict()  # Zobrist hash -> (index of the tile to move, moves left, optimal)
+        self._databases = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._cancel = threading.Event()
+        self._job = None  # (hash, grid size, tiles) waiting for the worker
+        self._key = None  # Zobrist hash of the board last passed to update()
+        self._stop = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="hint-search", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._stop = True
+        self._cancel.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # Game loop side
+    def update(self, board, previous_empty=None):
+        """Tell the service the board changed; stale searches are cancelled.
+
+        Pass previous_empty (as returned by board.move()) when the change was
+        one move from the board of the last update(), so the hash can be
+        updated instead of recomputed.
+        """
+        if previous_empty is None or self._key is None:
+            key = zobrist_hash(board)
+        else:
+            keys = get_zobrist_keys(board.size)
+            tile = board.tiles[previous_empty]
+            key = self._key ^ keys[tile][board.blank] ^ keys[tile][previous_empty]
+        self._key = key
+        with self._lock:
+            self._cancel.set()
+            self._cancel = threading.Event()
+            if key in self._table or board.is_solved():
+                self._job = None
+                return
+            self._job = (key, board.size, bytes(board.tiles))
+        self._wake.set()
+
+    def cancel(self):
+        """Stop the search in progress, e.g. when the player leaves the game."""
+        with self._lock:
+            self._cancel.set()
+            self._cancel = threading.Event()
+            self._job = None
+        self._key = None
+
+    def lookup(self, board):
+        """Return (index, moves left, optimal) from the table, or None if the board has not been solved yet."""
+        key = zobrist_hash(board)
+        with self._lock:
+            entry = self._table.get(key)
+            if entry is not None:
+                self._table.move_to_end(key)
+        return entry
+
+    def hint(self, board):
+        """Return the (row, col) of the tile to move next, or None if the board is solved.
+
+        Uses the move from the table once the worker has solved this board
+        (optimal up to OPTIMAL_UP_TO, unless the search ran out of time, and
+        from the fast solver otherwise) and the best greedy move until then.
+        Never blocks.
+        """
+        if board.is_solved():
+            return None
+        entry = self.lookup(board)
+        index = entry[0] if entry is not None else greedy_move(board.copy())
+        return board.position(index)
+
+    # Worker side
+    def _get_database(self, grid_size):
+        if not self.use_databases:
+            return None
+        if grid_size not in self._databases:
+            self._databases[grid_size] = load_pattern_databases(grid_size)
+        return self._databases[grid_size]
+
+    def _store_path(self, board, solution, optimal):
+        keys = get_zobrist_keys(board.size)
+        key = zobrist_hash(board)
+        with self._lock:
+            for number, (row, col) in enumerate(solution):
+                index = board.index(row, col)
+                entry = self._table.get(key)
+                if optimal or entry is None or not entry[2]:  # Never replace an optimal move with a fast one
+                    self._table[key] = (index, len(solution) - number, optimal)
+                self._table.move_to_end(key)
+                tile = board.tiles[index]
+                previous_empty = board.move(index)
+                key ^= keys[tile][index] ^ keys[tile][previous_empty]
+            while len(self._table) > self.table_size:
+                self._table.popitem(last=False)  # Drop the least recently used board
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                job, cancel = self._job, self._cancel
+                self._job = None
+            if job is None:
+                continue
+            _, grid_size, tiles = job
+            board = Board(grid_size, tiles)
+            optimal = grid_size <= OPTIMAL_UP_TO
+            try:
+                if optimal:
+                    solution = solve(board.to_grid(), timeout=SEARCH_TIMEOUT, database=self._get_database(grid_size),
+                                     cancel=cancel)
+                else:
+                    solution = solve_fast(board.to_grid())
+            except SolverTimeout:
+                if cancel.is_set():
+                    continue
+                optimal = False
+                solution = solve_fast(board.to_grid())
+            except (SolverCancelled, UnsolvableError):
+                continue
+            self._store_path(board, solution, optimal)
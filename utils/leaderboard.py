@@ -0,0 +1,227 @@
+import heapq
+import os
+import struct
+
+# Leaderboard storage.
+#
+# Every finished game is appended to scores.log as one fixed-size binary record,
+# and the log is never rewritten. In memory, each (mode, grid size) keeps only
+# its best TOP_K scores in a heap whose root is the worst kept score, so adding
+# a score is O(log K) and reading a leaderboard never touches the disk.
+#
+# Every COMPACT_EVERY appends the kept scores are written to scores.idx together
+# with the log offset they cover, so startup loads the index and only replays
+# the records appended after it instead of rescanning the whole log. The index
+# lists the scores best first, so ties keep their order when it is read back.
+#
+# A log that does not start with the right header is moved aside to
+# scores.log.bad and a new one started, and records with an unknown mode are
+# skipped, so a damaged file never stops a finished game from being saved.
+
+LOG_FILE = "scores.log"
+BAD_LOG_SUFFIX = ".bad"
+INDEX_FILE = "scores.idx"
+TOP_K = 10
+COMPACT_EVERY = 256
+NAME_LENGTH = 16
+
+MODES = ("classic", "time_attack")
+
+LOG_MAGIC = b"SLBL"
+INDEX_MAGIC = b"SLBI"
+VERSION = 1
+# mode, grid size, moves, time in milliseconds, name (UTF-8, zero padded)
+RECORD = struct.Struct(f"<BBII{NAME_LENGTH}s")
+LOG_HEADER = struct.Struct("<4sB")
+INDEX_HEADER = struct.Struct("<4sBHQI")  # magic, version, top k, log offset covered, record count
+
+
+# Function to pack one score into a record
+def pack_record(mode, grid_size, moves, time_ms, name):
+    encoded = name.encode("utf-8")[:NAME_LENGTH]
+    return RECORD.pack(MODES.index(mode), grid_size, moves, time_ms, encoded)
+
+
+# Function to unpack one record into a score dict
+def unpack_record(data, offset=0):
+    mode, grid_size, moves, time_ms, name = RECORD.unpack_from(data, offset)
+    return {
+        "mode": MODES[mode],
+        "grid_size": grid_size,
+        "moves": moves,
+        "time": time_ms / 1000,
+        "name": name.rstrip(b"\0").decode("utf-8", "ignore"),
+    }
+
+
+# Function to get the ranking key of a score (smaller is better)
+def rank_key(mode, moves, time_ms):
+    # Time attack is about speed; classic is about the fewest moves
+    return (time_ms, moves) if mode == "time_attack" else (moves, time_ms)
+
+
+class Leaderboard:
+    """Append-only score log with an in-memory top-K heap per (mode, grid size)."""
+
+    def __init__(self, directory=".", top_k=TOP_K, compact_every=COMPACT_EVERY):
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.top_k = top_k
+        self.compact_every = compact_every
+        self._heaps = {}  # (mode, grid_size) -> heap of (-rank, -sequence, record bytes)
+        self._sorted = {}  # (mode, grid_size) -> cached best-first list
+        self._sequence = 0  # Later scores lose ties
+        self._since_compact = 0
+        self._log = None
+        self._load()
+
+    # Startup
+    def _load(self):
+        log_offset = LOG_HEADER.size
+        index = self._read_index()
+        if index is not None:
+            log_offset, records = index
+            for record in records:
+                self._push(record)
+
+        self._log = open(self.log_path, "a+b")
+        self._log.seek(0)
+        if self._log.read(LOG_HEADER.size) not in (b"", LOG_HEADER.pack(LOG_MAGIC, VERSION)):
+            # Not a scores log (or a newer one): keep it for inspection and start again
+            self._log.close()
+            os.replace(self.log_path, self.log_path + BAD_LOG_SUFFIX)
+            self._log = open(self.log_path, "a+b")
+            log_offset = LOG_HEADER.size
+            self._heaps.clear()
+        self._log.seek(0, os.SEEK_END)
+        size = self._log.tell()
+        if size == 0:
+            self._log.write(LOG_HEADER.pack(LOG_MAGIC, VERSION))
+            self._log.flush()
+            size = LOG_HEADER.size
+        # Drop a record cut short by a crash so new records stay aligned
+        valid_end = LOG_HEADER.size + (size - LOG_HEADER.size) // RECORD.size * RECORD.size
+        if valid_end != size:
+            self._log.truncate(valid_end)
+        if log_offset > valid_end:
+            log_offset = LOG_HEADER.size  # The index is newer than the log, so replay everything
+            self._heaps.clear()
+
+        # Replay only the records appended after the last compaction
+        self._log.seek(log_offset)
+        tail = self._log.read(valid_end - log_offset)
+        for start in range(0, len(tail), RECORD.size):
+            if tail[start] < len(MODES):  # Skip a damaged record rather than refuse to start
+                self._push(tail[start:start + RECORD.size])
+        self._since_compact = len(tail) // RECORD.size
+
+    def _read_index(self):
+        # Return (log offset covered, records) from the index file, or None if it is missing,
+        # short or damaged, in which case the whole log is replayed instead
+        if not os.path.exists(self.index_path):
+            return None
+        with open(self.index_path, "rb") as f:
+            data = f.read()
+        if len(data) < INDEX_HEADER.size:
+            return None
+        magic, version, top_k, covered, count = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != VERSION or top_k != self.top_k:
+            return None
+        start = INDEX_HEADER.size
+        if len(data) != start + count * RECORD.size:
+            return None
+        if covered < LOG_HEADER.size or (covered - LOG_HEADER.size) % RECORD.size:
+            return None
+        records = [data[start + i * RECORD.size:start + (i + 1) * RECORD.size] for i in range(count)]
+        if any(record[0] >= len(MODES) for record in records):
+            return None
+        return covered, records
+
+    def _push(self, record):
+        mode, grid_size, moves, time_ms, _ = RECORD.unpack(record)
+        key = (MODES[mode], grid_size)
+        primary, secondary = rank_key(MODES[mode], moves, time_ms)
+        self._sequence += 1
+        entry = (-primary, -secondary, -self._sequence, record)
+        heap = self._heaps.setdefault(key, [])
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)  # Better than the worst kept score
+        else:
+            return False
+        self._sorted.pop(key, None)
+        return True
+
+    # Writing
+    def add_score(self, name, moves, seconds, mode="classic", grid_size=3):
+        """Record a finished game. Returns True if it made the top K."""
+        record = pack_record(mode, grid_size, moves, int(round(seconds * 1000)), name)
+        self._log.seek(0, os.SEEK_END)
+        self._log.write(record)
+        self._log.flush()
+        made_top = self._push(record)
+        self._since_compact += 1
+        if self._since_compact >= self.compact_every:
+            self.compact()
+        return made_top
+
+    def compact(self):
+        """Write the kept scores and the log offset they cover to the index file."""
+        self._log.flush()
+        self._log.seek(0, os.SEEK_END)
+        covered = self._log.tell()
+        # Best first, so reading the index back in order gives ties the same sequence order
+        records = [entry[3] for heap in self._heaps.values() for entry in sorted(heap, reverse=True)]
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, VERSION, self.top_k, covered, len(records)))
+            f.write(b"".join(records))
+        os.replace(temp_path, self.index_path)  # Readers never see a half-written index
+        self._since_compact = 0
+
+    # Reading
+    def top_scores(self, mode="classic", grid_size=3):
+        """Return the best scores for a mode and grid size, best first."""
+        key = (mode, grid_size)
+        scores = self._sorted.get(key)
+        if scores is None:
+            heap = self._heaps.get(key, [])
+            scores = self._sorted[key] = [unpack_record(entry[3]) for entry in sorted(heap, reverse=True)]
+        return list(scores)
+
+    def close(self):
+        if self._log is not None:
+            if self._since_compact:
+                self.compact()
+            self._log.close()
+            self._log = None
+
+
+_leaderboard = None
+
+
+# Function to get the shared leaderboard, opened on first use
+def get_leaderboard():
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = Leaderboard()
+    return _leaderboard
+
+
+# Function to load the best scores for a mode and grid size
+def load_scores(mode="classic", grid_size=3):
+    return get_leaderboard().top_scores(mode, grid_size)
+
+
+# Function to save the score of a finished game
+def save_score(name, moves, seconds, mode="classic", grid_size=3):
+    return get_leaderboard().add_score(name, moves, seconds, mode, grid_size)
+
+
+# Function to compact and close the shared leaderboard if it was opened
+def close_leaderboard():
+    global _leaderboard
+    if _leaderboard is not None:
+        _leaderboard.close()
+        _leaderboard = None
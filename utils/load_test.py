@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from utils.board import get_neighbours
+from utils.profiler import percentile
+
+# Load test for utils.server.
+#
+# Usage: python -m utils.load_test [--sessions 10000] [--connections 100] [--moves 20]
+#                                  [--unix PATH | --host HOST --port PORT]
+#
+# Opens the sessions spread over a number of connections, then plays rounds of
+# random legal moves: each round every connection pipelines one move for each
+# of its sessions and then reads the replies, so all the sessions are in play
+# at once. Latency is measured per move from writing the command to reading its
+# reply. Without --unix or --port it starts a server on a temporary Unix socket
+# and stops it afterwards.
+
+
+# Function to open one connection's sessions and play its rounds of moves
+async def run_connection(open_connection, sessions, size, rounds, seed, latencies):
+    reader, writer = await open_connection()
+    rng = random.Random(seed)
+    neighbours = get_neighbours(size)
+    counts = {"moves": 0, "errors": 0}
+    try:
+        new_command = json.dumps({"op": "new", "size": size}).encode() + b"\n"
+        writer.write(new_command * sessions)
+        await writer.drain()
+        blanks = {}  # Session id -> index of its empty space, kept up to date from the deltas
+        for _ in range(sessions):
+            state = json.loads(await reader.readline())
+            blanks[state["session"]] = state["tiles"].index(0)
+
+        for _ in range(rounds):
+            sent = []
+            for session_id, blank in blanks.items():
+                row, col = divmod(rng.choice(neighbours[blank]), size)
+                writer.write(b'{"op":"move","session":%d,"row":%d,"col":%d}\n' % (session_id, row, col))
+                sent.append(time.perf_counter())
+            await writer.drain()
+            for start in sent:
+                reply = json.loads(await reader.readline())
+                latencies.append(time.perf_counter() - start)
+                if reply["op"] == "delta":
+                    blanks[reply["session"]] = reply["set"][1][0]
+                    counts["moves"] += 1
+                else:
+                    counts["errors"] += 1  # e.g. a random walk that happened to solve its puzzle
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return counts
+
+
+# Function to run the whole load test against a server and return the results
+async def load_test(open_connection, sessions=10000, connections=100, rounds=20, size=4, seed=0):
+    latencies = []
+    per_connection = [sessions // connections + (1 if i < sessions % connections else 0) for i in range(connections)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_connection(open_connection, count, size, rounds, seed + i, latencies)
+                                     for i, count in enumerate(per_connection) if count))
+    seconds = time.perf_counter() - start
+    moves = sum(result["moves"] for result in results)
+    return {
+        "sessions": sessions,
+        "connections": len(results),
+        "grid_size": size,
+        "moves": moves,
+        "errors": sum(result["errors"] for result in results),
+        "seconds": seconds,
+        "moves_per_sec": moves / seconds if seconds else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "p99.9": percentile(latencies, 99.9) * 1000,
+            "max": max(latencies, default=0.0) * 1000,
+        },
+    }
+
+
+# Function to start a server on a Unix socket in a child process and wait until it listens
+def start_server(unix_path):
+    server = subprocess.Popen([sys.executable, "-m", "utils.server", "--unix", unix_path], stdout=subprocess.PIPE,
+                              text=True)
+    server.stdout.readline()  # "Listening on ..."
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the slider puzzle server")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--moves", type=int, default=20, help="moves per session")
+    parser.add_argument("--size", type=int, default=4, help="grid size of every session")
+    parser.add_argument("--unix", help="Unix socket of a running server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="TCP port of a running server")
+    args = parser.parse_args()
+
+    server_process = None
+    temp_dir = None
+    unix_path = args.unix
+    if unix_path is None and args.port is None:
+        temp_dir = tempfile.mkdtemp()
+        unix_path = os.path.join(temp_dir, "server.sock")
+        server_process = start_server(unix_path)
+
+    if unix_path is not None:
+        connect = lambda: asyncio.open_unix_connection(unix_path, limit=2 ** 20)
+    else:
+        connect = lambda: asyncio.open_connection(args.host, args.port, limit=2 ** 20)
+    try:
+        report = asyncio.run(load_test(connect, args.sessions, args.connections, args.moves, args.size))
+    finally:
+        if server_process is not None:
+            server_process.send_signal(signal.SIGINT)  # The server prints its totals as it stops
+            print(f"Server: {server_process.communicate()[0].strip()}")
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            os.rmdir(temp_dir)
+
+    latency = report["latency_ms"]
+    print(f"{report['sessions']} sessions on {report['connections']} connections: {report['moves']} moves "
+          f"({report['errors']} errors) in {report['seconds']:.2f}s, {report['moves_per_sec']:.0f} moves/sec, "
+          f"latency p50 {latency['p50']:.2f} ms p99 {latency['p99']:.2f} ms p99.9 {latency['p99.9']:.2f} ms")
@@ -0,0 +1,213 @@
+import mmap
+import os
+import sys
+
+# Additive disjoint pattern databases for the slider puzzle.
+#
+# Each database covers a group of tiles and stores, for every placement of those
+# tiles, the fewest moves of *those tiles* needed to bring them home; moves of
+# the other tiles are free. Groups never share a tile, so the values
+# of all groups can be added together and still never overestimate.
+#
+# A table is a flat byte array indexed by sum(position_i * cells**i) over the
+# tiles of the group, so a single move only changes one term of the index and
+# the solver can update it in O(1). Placements with two tiles on one cell are
+# never looked up, so most of a 6-tile table is filler; a ranked index would be
+# about a third of the size but cost O(k) to update on every move. The tables
+# are written once by build_pattern_databases() and afterwards only ever read
+# through mmap.
+
+PDB_DIR = os.path.join("src", "pdb")
+MAGIC = b"SPDB"
+UNSEEN = 255
+
+# Default tile groups per grid size.
+#
+# These make 3x3 instant, and with the mirror-image lookup in utils.solver most
+# 4x4 boards take a few seconds or less with IDA*. The hardest 4x4 boards (60
+# moves and up) still take half a minute or more, so callers that must answer
+# give solve() a timeout. The
+# 5x5 groups are only four tiles each, because a 6-tile 5x5 table would need
+# 25**6 bytes (244 MB) and hours to build in Python. With them, optimal search
+# on a random 5x5 board usually does not finish in any useful time, so treat
+# 5x5 as out of reach for optimal solving and use utils.fast_solver instead.
+DEFAULT_PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    5: ((1, 2, 6, 7), (3, 4, 8, 9), (5, 10, 15, 20), (11, 12, 16, 17), (13, 14, 18, 19), (21, 22, 23, 24)),
+}
+
+
+# Function to get the file path of one pattern database
+def pattern_db_path(grid_size, tiles, directory=PDB_DIR):
+    name = f"{grid_size}x{grid_size}-" + "-".join(str(tile) for tile in tiles) + ".pdb"
+    return os.path.join(directory, name)
+
+
+# Function to expand a batch of (tiles, blank) states by one blank move
+def _expand(states, grid_size, weights, table, value, zero_cost):
+    import numpy as np
+
+    n = grid_size
+    cells = n * n
+    k = len(weights) - 1
+    positions = (states[None, :] // weights[:, None]) % cells
+    blank = positions[k]
+    rows, cols = blank // n, blank % n
+    found = []
+    for step, allowed in ((-n, rows > 0), (n, rows < n - 1), (-1, cols > 0), (1, cols < n - 1)):
+        target = blank + step
+        if zero_cost:
+            # The blank swaps with a tile outside the group, which costs nothing
+            moved = allowed & ~np.any(positions[:k] == target[None, :], axis=0)
+            candidates = [states[moved] + step * weights[k]]
+        else:
+            # The blank swaps with tile i of the group, which costs one move
+            candidates = [states[allowed & (positions[i] == target)] + step * (weights[k] - weights[i]) for i in range(k)]
+        for new_states in candidates:
+            new_states = new_states[table[new_states] == UNSEEN]
+            table[new_states] = value
+            found.append(new_states)
+    return np.concatenate(found)
+
+
+# Function to build the distance table for one group of tiles
+def build_pattern_table(grid_size, tiles):
+    """Breadth-first search outward from the solved grid and return the table as bytes.
+
+    The search runs over (group tile positions, blank position) so that moves of
+    other tiles are free and every move of a group tile costs one; the stored
+    value is the minimum over all blank positions.
+    """
+    import numpy as np
+
+    n = grid_size
+    cells = n * n
+    k = len(tiles)
+    weights = np.array([cells ** i for i in range(k + 1)], dtype=np.int64)  # The last digit is the blank
+
+    table = np.full(cells ** (k + 1), UNSEEN, dtype=np.uint8)
+    # Tile t sits at position t - 1 in the solved grid; the blank may start on any other cell
+    home = sum((tile - 1) * cells ** i for i, tile in enumerate(tiles))
+    for blank in range(cells):
+        if blank + 1 not in tiles:
+            table[home + blank * cells ** k] = 0
+
+    chunk_size = 1 << 18
+    depth = 0
+    while True:
+        # Close the current layer under free moves, then step out to the next layer
+        new_states = np.flatnonzero(table == depth)
+        if new_states.size == 0:
+            break
+        while new_states.size:
+            new_states = np.concatenate([
+                _expand(new_states[start:start + chunk_size], n, weights, table, depth, True)
+                for start in range(0, new_states.size, chunk_size)
+            ])
+        if depth + 1 >= UNSEEN:
+            raise ValueError("Pattern database depth does not fit in a byte")
+        layer = np.flatnonzero(table == depth)
+        for start in range(0, layer.size, chunk_size):
+            _expand(layer[start:start + chunk_size], n, weights, table, depth + 1, False)
+        depth += 1
+
+    # Keep the cheapest blank position for every placement of the group
+    return table.reshape(cells, cells ** k).min(axis=0).tobytes()
+
+
+# Function to write one pattern database file
+def write_pattern_db(path, grid_size, tiles, table):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC + bytes([grid_size, len(tiles)]) + bytes(tiles))
+        f.write(table)
+    os.replace(temp_path, path)  # Readers never see a half-written file
+
+
+# Function to build and save all pattern databases for a grid size
+def build_pattern_databases(grid_size, partition=None, directory=PDB_DIR):
+    partition = partition or DEFAULT_PARTITIONS[grid_size]
+    paths = []
+    for tiles in partition:
+        path = pattern_db_path(grid_size, tiles, directory)
+        write_pattern_db(path, grid_size, tiles, build_pattern_table(grid_size, tiles))
+        paths.append(path)
+    return paths
+
+
+class PatternDatabase:
+    """One memory-mapped pattern database table."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._mmap[:6]
+        if header[:4] != MAGIC:
+            raise ValueError(f"{path} is not a pattern database")
+        self.grid_size = header[4]
+        count = header[5]
+        self.tiles = tuple(self._mmap[6:6 + count])
+        cells = self.grid_size * self.grid_size
+        self.weights = tuple(cells ** i for i in range(count))
+        # Zero-copy view that starts at the first table entry
+        self.table = memoryview(self._mmap)[6 + count:]
+        if len(self.table) != cells ** count:
+            raise ValueError(f"{path} is truncated")
+
+    def index(self, tiles):
+        """Return the table index for a flat board (0 is the empty space)."""
+        where = {tile: pos for pos, tile in enumerate(tiles)}
+        return sum(where[tile] * weight for tile, weight in zip(self.tiles, self.weights))
+
+    def close(self):
+        self.table.release()
+        self._mmap.close()
+
+
+class AdditivePatternDatabase:
+    """A set of disjoint pattern databases whose values are summed."""
+
+    def __init__(self, databases):
+        self.databases = list(databases)
+        grid_size = self.databases[0].grid_size
+        self.grid_size = grid_size
+        self.tables = [db.table for db in self.databases]
+        # group_of[tile] is the database covering the tile (-1 for none), weight_of[tile] its index weight
+        self.group_of = [-1] * (grid_size * grid_size)
+        self.weight_of = [0] * (grid_size * grid_size)
+        for group, db in enumerate(self.databases):
+            for tile, weight in zip(db.tiles, db.weights):
+                if self.group_of[tile] != -1:
+                    raise ValueError(f"Tile {tile} is in more than one pattern database")
+                self.group_of[tile] = group
+                self.weight_of[tile] = weight
+
+    def indexes(self, tiles):
+        return [db.index(tiles) for db in self.databases]
+
+    def value(self, indexes):
+        return sum(table[i] for table, i in zip(self.tables, indexes))
+
+    def close(self):
+        for db in self.databases:
+            db.close()
+
+
+# Function to load the pattern databases for a grid size, or None if they have not been built
+def load_pattern_databases(grid_size, partition=None, directory=PDB_DIR):
+    partition = partition or DEFAULT_PARTITIONS.get(grid_size)
+    if not partition:
+        return None
+    paths = [pattern_db_path(grid_size, tiles, directory) for tiles in partition]
+    if not all(os.path.exists(path) for path in paths):
+        return None
+    return AdditivePatternDatabase(PatternDatabase(path) for path in paths)
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.pattern_db 4 [5 ...]
+    for size in sys.argv[1:] or ["4"]:
+        for built in build_pattern_databases(int(size)):
+            print(f"Wrote {built}")
@@ -0,0 +1,188 @@
+import bisect
+import gc
+import json
+import os
+import sys
+import time
+from array import array
+from functools import wraps
+
+# Opt-in frame profiler.
+#
+# Set SLIDER_PROFILE to turn it on: SLIDER_PROFILE=1 python main.py writes
+# profile.json at exit, and any other value is used as the output path. While it
+# is on, main() times each phase of a frame (event handling, drawing, flip) and
+# instrument() swaps hot functions like move_tile for timed wrappers, so when
+# it is off nothing is wrapped and the loop only checks for None.
+#
+# The most recent CAPACITY timings of each phase are kept in a fixed-size ring
+# buffer for the on-screen p50/p99, and every timing also lands in a histogram
+# covering the whole run, which is what gets exported. Allocations are the net
+# change in Python's allocated memory blocks over a frame.
+
+PROFILE_ENV = "SLIDER_PROFILE"
+PROFILE_FILE = "profile.json"
+CAPACITY = 1024
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133)  # Upper edges; the last bucket is everything above
+
+
+# Function to get a percentile (0-100) of a list of numbers
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+# Function to summarise per-call timings (in seconds) in milliseconds
+def summarize_times(times):
+    return {
+        "count": len(times),
+        "p50_ms": percentile(times, 50) * 1000,
+        "p99_ms": percentile(times, 99) * 1000,
+        "mean_ms": sum(times) / len(times) * 1000 if times else 0.0,
+    }
+
+
+class RingBuffer:
+    """Fixed-size buffer of floats that keeps only the most recent values."""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.values = array("d", bytes(8 * capacity))
+        self.count = 0  # Values ever added
+
+    def append(self, value):
+        self.values[self.count % self.capacity] = value
+        self.count += 1
+
+    def recent(self):
+        """Return the kept values, oldest first."""
+        if self.count <= self.capacity:
+            return self.values[:self.count].tolist()
+        start = self.count % self.capacity
+        return self.values[start:].tolist() + self.values[:start].tolist()
+
+
+class Phase:
+    """Recent timings of one phase plus a histogram of all of them."""
+
+    def __init__(self, capacity=CAPACITY):
+        self.recent = RingBuffer(capacity)
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.recent.append(seconds)
+        self.histogram[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        self.total += seconds
+
+
+class FrameProfiler:
+    """Per-phase frame timings, allocation counts and garbage collections."""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.phases = {}  # Phase name -> Phase, in the order first recorded
+        self.allocations = RingBuffer(capacity)  # Net allocated blocks per frame
+        self.frame_starts = RingBuffer(capacity)
+        self.gc_collections = 0
+        self.overlay_visible = True
+        self._frame_start = 0.0
+        self._frame_blocks = 0
+        self._wrapped = []
+        gc.callbacks.append(self._count_collection)
+
+    def _count_collection(self, phase, info):
+        if phase == "start":
+            self.gc_collections += 1
+
+    # Recording
+    def add(self, name, seconds):
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self.capacity)
+        phase.add(seconds)
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+        self.frame_starts.append(self._frame_start)
+        self._frame_blocks = sys.getallocatedblocks()
+
+    def end_frame(self):
+        self.add("frame", time.perf_counter() - self._frame_start)
+        self.allocations.append(sys.getallocatedblocks() - self._frame_blocks)
+
+    def instrument(self, namespace, name, phase=None):
+        """Replace namespace.name with a wrapper that times every call; close() puts it back."""
+        func = getattr(namespace, name)
+        add, clock, phase = self.add, time.perf_counter, phase or name
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add(phase, clock() - start)
+
+        setattr(namespace, name, timed)
+        self._wrapped.append((namespace, name, func))
+
+    # Reading
+    def fps(self, frames=30):
+        """Frames drawn per second over the last few frames."""
+        starts = self.frame_starts.recent()[-frames:]
+        if len(starts) < 2 or starts[-1] == starts[0]:
+            return 0.0
+        return (len(starts) - 1) / (starts[-1] - starts[0])
+
+    def summary(self):
+        return {name: summarize_times(phase.recent.recent()) for name, phase in self.phases.items()}
+
+    def overlay_lines(self):
+        """Return the overlay text: FPS, allocations and collections, then p50/p99 ms per phase."""
+        allocations = self.allocations.recent()
+        lines = [f"{self.fps():.1f} FPS  alloc {percentile(allocations, 50):+.0f}/{percentile(allocations, 99):+.0f}"
+                 f"  gc {self.gc_collections}"]
+        cells = [f"{name} {times['p50_ms']:.2f}/{times['p99_ms']:.2f}" for name, times in self.summary().items()]
+        for i in range(0, len(cells), 2):
+            lines.append("  ".join(cells[i:i + 2]))
+        return lines
+
+    # Exporting
+    def export(self, path=PROFILE_FILE):
+        """Write the per-phase histograms and recent percentiles to a JSON file."""
+        recent = self.summary()
+        allocations = self.allocations.recent()
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "buckets_ms": list(BUCKETS_MS),
+            "phases": {name: dict(recent[name], calls=sum(phase.histogram), total_ms=phase.total * 1000,
+                                  histogram=phase.histogram)
+                       for name, phase in self.phases.items()},
+            "allocations_per_frame": {"p50": percentile(allocations, 50), "p99": percentile(allocations, 99)},
+            "gc_collections": self.gc_collections,
+        }
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(temp_path, path)
+        return path
+
+    def close(self):
+        """Put the instrumented functions back and stop counting collections."""
+        while self._wrapped:
+            namespace, name, func = self._wrapped.pop()
+            setattr(namespace, name, func)
+        if self._count_collection in gc.callbacks:
+            gc.callbacks.remove(self._count_collection)
+
+
+# Function to get the export path from SLIDER_PROFILE, or None when profiling is off
+def profile_path_from_environment():
+    value = os.environ.get(PROFILE_ENV, "")
+    if value in ("", "0"):
+        return None
+    return PROFILE_FILE if value == "1" else value
@@ -0,0 +1,168 @@
+import json
+import os
+import random
+import threading
+from collections import deque
+from utils.generator import generate_board
+from utils.solver import linear_conflict_distance, solve
+
+# Puzzle bank.
+#
+# Keeps a small queue of ready-made puzzles per (grid size, difficulty) so
+# starting a game never waits on generation. A background thread refills any
+# queue that drops below LOW_WATER, and the queues are saved to
+# puzzle_bank.json on close so the next run starts with a full bank.
+#
+# Puzzles are drawn uniformly from the solvable boards by seed (the same seeds
+# replays use) and sorted into "easy", "medium" and "hard" by the thirds of
+# their difficulty. Difficulty is the optimal solution length on 3x3 and the
+# Manhattan distance + linear conflict lower bound on larger boards, where
+# optimal search is too slow to run per puzzle. The cut-offs between bands are
+# measured once per grid size from a sample of boards.
+#
+# Only the seeds are kept, in memory and in puzzle_bank.json, and pop() builds
+# the board from its seed (about 20 microseconds), so the board played is always the one
+# a replay of the game will rebuild. Anything in the file that is not a seed
+# where one is expected is dropped when the bank is loaded.
+
+BANK_FILE = "puzzle_bank.json"
+DIFFICULTIES = ("easy", "medium", "hard")
+GRID_SIZES = (3, 4, 5, 6, 7, 8)
+CAPACITY = 8
+LOW_WATER = 3
+CALIBRATION_SAMPLES = 300
+
+
+# Function to measure how hard a board is
+def measure_difficulty(board):
+    grid = board.to_grid()
+    if board.size <= 3:
+        return len(solve(grid))
+    return linear_conflict_distance(grid)
+
+
+# Function to check that a value read from the bank file is a usable seed
+def _is_seed(value):
+    return type(value) is int and 0 <= value < 2 ** 64
+
+
+class PuzzleBank:
+    """Per-(grid size, difficulty) queues of ready puzzles, refilled in the background."""
+
+    def __init__(self, path=BANK_FILE, sizes=GRID_SIZES, capacity=CAPACITY, low_water=LOW_WATER):
+        self.path = path
+        self.sizes = tuple(sizes)
+        self.capacity = capacity
+        self.low_water = low_water
+        self._queues = {(size, band): deque() for size in self.sizes for band in DIFFICULTIES}
+        self._thresholds = {}  # grid size -> (easy/medium cut-off, medium/hard cut-off)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+        self._rng = random.Random()
+        self.load()
+
+    # Background refilling
+    def start(self):
+        """Start the refill thread (does nothing if it is already running)."""
+        if self._thread is None:
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="puzzle-bank", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop:
+            self._wake.clear()
+            for size in self.sizes:
+                while not self._stop and self._needs_refill(size):
+                    self._add_candidate(size)
+            self._wake.wait()
+
+    def _needs_refill(self, size, level=None):
+        level = self.capacity if level is None else level
+        return any(len(self._queues[(size, band)]) < level for band in DIFFICULTIES)
+
+    def _band_of(self, size, difficulty):
+        if size not in self._thresholds:
+            samples = sorted(measure_difficulty(generate_board(size, rng=self._rng)) for _ in range(CALIBRATION_SAMPLES))
+            self._thresholds[size] = (samples[len(samples) // 3], samples[2 * len(samples) // 3])
+        easy_below, hard_from = self._thresholds[size]
+        if difficulty < easy_below:
+            return "easy"
+        return "hard" if difficulty >= hard_from else "medium"
+
+    def _add_candidate(self, size):
+        seed = self._rng.randrange(2 ** 63)
+        board = generate_board(size, seed=seed)
+        band = self._band_of(size, measure_difficulty(board))
+        with self._lock:
+            queue = self._queues[(size, band)]
+            if len(queue) < self.capacity:
+                queue.append(seed)
+
+    # Taking puzzles
+    def pop(self, grid_size, difficulty="medium"):
+        """Return (seed, Board) for a puzzle, straight from the bank when one is ready.
+
+        If the queue is empty a uniform random puzzle is generated on the spot
+        instead of waiting, and the refill thread is woken either way when the
+        queue runs low.
+        """
+        queue = self._queues.get((grid_size, difficulty))
+        with self._lock:
+            seed = queue.popleft() if queue else None
+        if queue is None or len(queue) < self.low_water:
+            self._wake.set()
+        if seed is None:
+            seed = self._rng.randrange(2 ** 63)
+        return seed, generate_board(grid_size, seed=seed)
+
+    def available(self, grid_size, difficulty="medium"):
+        return len(self._queues.get((grid_size, difficulty), ()))
+
+    # Persistence
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # A damaged bank is simply refilled
+        if not isinstance(data, dict):
+            return
+        thresholds = data.get("thresholds")
+        if isinstance(thresholds, dict):
+            for size, cut_offs in thresholds.items():
+                if (size.isdigit() and isinstance(cut_offs, list) and len(cut_offs) == 2
+                        and all(type(cut_off) in (int, float) for cut_off in cut_offs)):
+                    self._thresholds[int(size)] = tuple(cut_offs)
+        queues = data.get("queues")
+        if isinstance(queues, dict):
+            for key, seeds in queues.items():
+                size, _, band = key.partition(":")
+                queue = self._queues.get((int(size), band)) if size.isdigit() else None
+                if queue is not None and isinstance(seeds, list):
+                    queue.extend([seed for seed in seeds if _is_seed(seed)][:self.capacity])
+
+    def save(self):
+        with self._lock:
+            data = {
+                "thresholds": {str(size): list(cut_offs) for size, cut_offs in self._thresholds.items()},
+                "queues": {f"{size}:{band}": list(queue) for (size, band), queue in self._queues.items()},
+            }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        """Stop the refill thread and save the bank."""
+        self._stop = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.save()
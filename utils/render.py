@@ -0,0 +1,117 @@
+import pygame
+
+# Render cache for the game board.
+#
+# Looking up a SysFont and rendering text are the slowest parts of drawing a
+# frame, so fonts are created once per size, static labels are rendered once,
+# and all the tiles of a board layout are drawn once onto a single atlas
+# surface. After that a frame is one Surface.blits() call.
+#
+# An atlas is laid out like the solved board: tile v sits in cell v - 1 and the
+# empty space in the last cell. Each tile is a subsurface of its cell, so the
+# tiles are views into the atlas rather than copies. For a picture puzzle the
+# atlas is the picture scaled to the board, so the tiles are pieces of it.
+# default_picture() draws one when no picture file is around.
+
+
+# Function to draw the built-in picture: a four-colour gradient with rings, so every piece looks different
+def default_picture(size):
+    corners = pygame.Surface((2, 2), 0, 32)
+    for pos, color in zip(((0, 0), (1, 0), (0, 1), (1, 1)),
+                          ((235, 90, 120), (250, 200, 90), (80, 120, 230), (90, 210, 170))):
+        corners.set_at(pos, color)
+    picture = pygame.transform.smoothscale(corners, (size, size))
+    step = max(1, size // 10)
+    for radius in range(step, size, step):
+        pygame.draw.circle(picture, (255, 255, 255), (size // 3, size // 3), radius, max(1, size // 100))
+    pygame.draw.line(picture, (40, 40, 60), (0, size - 1), (size - 1, 0), max(1, size // 50))
+    return picture
+
+
+class TileAtlas:
+    """All the tiles of one board layout on one surface, plus where each board index is drawn."""
+
+    def __init__(self, grid_size, tile_size, margin, origin, tile_color, text_color, background, font=None,
+                 image=None):
+        side = tile_size - margin
+        cells = grid_size * grid_size
+        self.surface = pygame.Surface((grid_size * tile_size, grid_size * tile_size))
+        if image is not None:
+            pygame.transform.smoothscale(image, self.surface.get_size(), self.surface)
+        else:
+            self.surface.fill(background)
+
+        views = []
+        for cell in range(cells):
+            row, col = divmod(cell, grid_size)
+            view = self.surface.subsurface((col * tile_size, row * tile_size, side, side))
+            if cell == cells - 1:
+                view.fill(background)  # The empty space
+            elif image is None:
+                view.fill(tile_color)
+                text = font.render(str(cell + 1), True, text_color)
+                # Centred on the full tile cell; the view clips anything past the tile edge
+                view.blit(text, ((tile_size - text.get_width()) // 2, (tile_size - text.get_height()) // 2))
+            views.append(view)
+        self.tiles = [views[-1]] + views[:-1]  # Indexed by tile value, 0 being the empty space
+
+        # Screen rect of every board index
+        x, y = origin
+        self.rects = [pygame.Rect(x + col * tile_size + margin, y + row * tile_size + margin, side, side)
+                      for row in range(grid_size) for col in range(grid_size)]
+
+    def blits(self, tiles, indexes):
+        """Return the (surface, rect) pairs that draw the given board indexes, for Surface.blits()."""
+        views, rects = self.tiles, self.rects
+        return [(views[tiles[index]], rects[index]) for index in indexes]
+
+
+class RenderCache:
+    """Caches fonts per size, tile atlases, pictures and rendered labels."""
+
+    def __init__(self, font_name="Roboto Mono"):
+        self.font_name = font_name
+        self._fonts = {}
+        self._atlases = {}
+        self._images = {}
+        self._labels = {}
+
+    def font(self, size):
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = pygame.font.SysFont(self.font_name, size)
+        return font
+
+    def image(self, path):
+        """Return the picture loaded from path, read from disk only the first time."""
+        image = self._images.get(path)
+        if image is None:
+            image = pygame.image.load(path)
+            if pygame.display.get_surface() is not None:
+                image = image.convert()  # Match the screen format so blits need no conversion
+            self._images[path] = image
+        return image
+
+    def atlas(self, grid_size, tile_size, margin, origin, tile_color, text_color, background, image=None):
+        """Return the TileAtlas for a board layout, built once per layout and picture."""
+        key = (grid_size, tile_size, margin, origin, tile_color, text_color, background, image)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            font = None if image is not None else self.font(tile_size // 2)
+            atlas = self._atlases[key] = TileAtlas(grid_size, tile_size, margin, origin, tile_color, text_color,
+                                                   background, font, image)
+        return atlas
+
+    def text(self, font, text, color):
+        """Return a rendered label, built once and reused for static text like button labels."""
+        key = (font, text, color)
+        surface = self._labels.get(key)
+        if surface is None:
+            surface = self._labels[key] = font.render(text, True, color)
+        return surface
+
+    def clear(self):
+        self._fonts.clear()
+        self._atlases.clear()
+        self._images.clear()
+        self._labels.clear()
@@ -0,0 +1,188 @@
+import argparse
+import os
+import struct
+import sys
+import time
+from multiprocessing import Pool
+from utils.generator import generate_board
+
+# Game replays.
+#
+# A replay is the puzzle seed plus every move, so the exact game can be played
+# back without any rendering. Each move is stored as the direction the empty
+# space moved in (2 bits, four moves per byte) and the time since the previous
+# move in milliseconds as a varint, so a typical game packs into a few hundred
+# bytes.
+#
+# Layout: magic, version, grid size, seed, varint move count, packed directions,
+# then one varint time delta per move.
+
+MAGIC = b"SLRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBBQ")
+REPLAY_DIR = "replays"
+
+UP, DOWN, LEFT, RIGHT = range(4)
+
+
+# Function to get how far the empty space moves in each direction on a board
+def direction_offsets(grid_size):
+    return (-grid_size, grid_size, -1, 1)
+
+
+# Function to append an unsigned varint to a bytearray
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+# Function to read an unsigned varint, returning (value, next offset)
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class ReplayRecorder:
+    """Records the moves of one game as they are played."""
+
+    def __init__(self, grid_size, seed, start_time=None):
+        self.grid_size = grid_size
+        self.seed = seed
+        self.start_time = time.time() if start_time is None else start_time
+        self.count = 0
+        self.directions = bytearray()
+        self.deltas = bytearray()
+        self._last_ms = 0
+
+    def record(self, previous_empty, new_empty, when=None):
+        """Record a move that took the empty space from previous_empty to new_empty."""
+        offset = new_empty - previous_empty
+        direction = direction_offsets(self.grid_size).index(offset)
+        if self.count % 4 == 0:
+            self.directions.append(0)
+        self.directions[-1] |= direction << (2 * (self.count % 4))
+        self.count += 1
+
+        elapsed_ms = int(((time.time() if when is None else when) - self.start_time) * 1000)
+        write_varint(self.deltas, max(0, elapsed_ms - self._last_ms))
+        self._last_ms = max(self._last_ms, elapsed_ms)
+
+    def encode(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.grid_size, self.seed))
+        write_varint(out, self.count)
+        out += self.directions
+        out += self.deltas
+        return bytes(out)
+
+
+# Function to decode a replay into (grid_size, seed, directions, time deltas in ms)
+def decode_replay(data):
+    magic, version, grid_size, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a replay")
+    count, offset = read_varint(data, HEADER.size)
+    packed = data[offset:offset + (count + 3) // 4]
+    if len(packed) != (count + 3) // 4:
+        raise ValueError("Replay is truncated")
+    directions = [(packed[i >> 2] >> (2 * (i & 3))) & 3 for i in range(count)]
+    offset += len(packed)
+    deltas = []
+    for _ in range(count):
+        delta, offset = read_varint(data, offset)
+        deltas.append(delta)
+    return grid_size, seed, directions, deltas
+
+
+# Function to play a replay back on a fresh board
+def play_replay(data):
+    """Re-run a replay at full speed and return a result dict.
+
+    The result has "valid" (every move was legal), "solved", "moves", "time"
+    (seconds) and, when something is wrong, "error".
+    """
+    try:
+        grid_size, seed, directions, deltas = decode_replay(data)
+    except (ValueError, IndexError, struct.error) as e:
+        return {"valid": False, "solved": False, "moves": 0, "time": 0.0, "error": str(e)}
+    board = generate_board(grid_size, seed=seed)
+    offsets = direction_offsets(grid_size)
+    for number, direction in enumerate(directions):
+        # move() rejects anything not next to the empty space, including wrapping around a row
+        if board.move(board.blank + offsets[direction]) == -1:
+            return {"valid": False, "solved": False, "moves": number, "time": sum(deltas[:number]) / 1000,
+                    "error": f"Illegal move {number + 1}"}
+    return {"valid": True, "solved": board.is_solved(), "moves": len(directions), "time": sum(deltas) / 1000}
+
+
+# Function to check one leaderboard submission: (replay bytes, claimed moves, claimed seconds)
+def verify_submission(submission):
+    data, claimed_moves, claimed_seconds = submission
+    result = play_replay(data)
+    if not result["valid"]:
+        result["accepted"] = False
+    elif not result["solved"]:
+        result["accepted"] = False
+        result["error"] = "Replay does not reach the solved board"
+    elif claimed_moves is not None and claimed_moves != result["moves"]:
+        result["accepted"] = False
+        result["error"] = f"Claimed {claimed_moves} moves, replay has {result['moves']}"
+    elif claimed_seconds is not None and abs(claimed_seconds - result["time"]) > 1:
+        result["accepted"] = False
+        result["error"] = f"Claimed {claimed_seconds}s, replay took {result['time']:.1f}s"
+    else:
+        result["accepted"] = True
+    return result
+
+
+# Function to verify many submissions in parallel
+def verify_submissions(submissions, processes=None, chunksize=256):
+    """Verify submissions with a process pool and return (results, stats)."""
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        results = list(pool.imap(verify_submission, submissions, chunksize=chunksize))
+    seconds = time.perf_counter() - start
+    accepted = sum(1 for result in results if result["accepted"])
+    stats = {
+        "checked": len(results),
+        "accepted": accepted,
+        "rejected": len(results) - accepted,
+        "seconds": seconds,
+        "replays_per_sec": len(results) / seconds if seconds else 0.0,
+    }
+    return results, stats
+
+
+# Function to save a replay to the replays folder and return its path
+def save_replay(data, name, directory=REPLAY_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name + ".rpl")
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify slider puzzle replays")
+    parser.add_argument("files", nargs="+", help="replay files to check")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    submissions = []
+    for path in args.files:
+        with open(path, "rb") as f:
+            submissions.append((f.read(), None, None))
+    results, stats = verify_submissions(submissions, args.processes)
+    for path, result in zip(args.files, results):
+        status = "ok" if result["accepted"] else f"REJECTED ({result.get('error')})"
+        print(f"{path}: {result['moves']} moves, {result['time']:.1f}s, {status}")
+    print(f"{stats['checked']} checked, {stats['rejected']} rejected, {stats['replays_per_sec']:.0f} replays/sec")
+    sys.exit(1 if stats["rejected"] else 0)
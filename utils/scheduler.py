@@ -0,0 +1,60 @@
+import time
+import pygame
+
+# Event-driven frame scheduling.
+#
+# Screens are only redrawn when something changed: input, a timer rolling over to
+# the next second, or an animation asking for another frame. In between, the
+# loop sleeps inside pygame.event.wait() instead of polling, so an idle window
+# costs next to no CPU while clicks still wake it immediately.
+
+# Events that change what is on screen
+REDRAW_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED)
+
+
+class FrameScheduler:
+    """Tracks whether the screen needs redrawing and when to wake up next."""
+
+    def __init__(self):
+        self.dirty = True
+        self.wake_at = None  # time.monotonic() of the next timed redraw
+
+    def invalidate(self):
+        """Mark the screen as needing a redraw on the next loop."""
+        self.dirty = True
+
+    def schedule(self, delay):
+        """Ask for a redraw in delay seconds (the earliest request wins)."""
+        wake_at = time.monotonic() + max(0.0, delay)
+        if self.wake_at is None or wake_at < self.wake_at:
+            self.wake_at = wake_at
+
+    def animate(self):
+        """Ask for another frame as soon as possible, for animations."""
+        self.dirty = True
+
+    def frame_drawn(self):
+        self.dirty = False
+
+    def wait(self):
+        """Return the pending events, blocking until there is input or a redraw is due."""
+        self._check_timer()
+        if self.dirty:
+            events = pygame.event.get()
+        else:
+            if self.wake_at is None:
+                event = pygame.event.wait()
+            else:
+                timeout = max(1, int((self.wake_at - time.monotonic()) * 1000))
+                event = pygame.event.wait(timeout)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events += pygame.event.get()
+            self._check_timer()
+        if any(event.type in REDRAW_EVENTS for event in events):
+            self.dirty = True
+        return events
+
+    def _check_timer(self):
+        if self.wake_at is not None and time.monotonic() >= self.wake_at:
+            self.wake_at = None
+            self.dirty = True
@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import stat
+import time
+from utils.core import is_puzzle_completed, slide_tile
+from utils.generator import generate_board
+
+# Multi-session game server.
+#
+# Usage: python -m utils.server [--host 127.0.0.1] [--port 8765] [--unix PATH]
+#
+# Hosts any number of games at once for tournaments and bots. Clients connect
+# over TCP or a Unix socket and send one JSON command per line; every command
+# gets exactly one JSON line back, in order, so clients can pipeline them. One
+# connection can drive many sessions, and its sessions end when it disconnects.
+#
+#   {"op": "new", "size": 4, "seed": 7}       -> {"op": "state", "session": 1, "size": 4, "seed": 7,
+#                                                 "tiles": [...], "moves": 0, "solved": false}
+#   {"op": "move", "session": 1, "row": 2, "col": 3}
+#                                              -> {"op": "delta", "session": 1, "moves": 1,
+#                                                  "set": [[11, 0], [15, 12]], "solved": false}
+#   {"op": "state", "session": 1}              -> the full state again
+#   {"op": "close", "session": 1}              -> {"op": "closed", "session": 1, "moves": 1, "solved": false,
+#                                                  "time": null}
+#   anything wrong                             -> {"op": "error", "error": "..."}
+#
+# A delta lists the (board index, tile) pairs that changed, 0 being the empty
+# space. Each session is a Board (a bytearray of tiles with its own counters)
+# plus a few numbers, and moves go through the same slide_tile() and
+# is_puzzle_completed() as the game.
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_SESSIONS = 100000
+MAX_GRID_SIZE = 16
+HIGH_WATER = 64 * 1024  # Bytes of queued replies before waiting for the client to read them
+
+# Moves are by far the most common reply, so they skip json.dumps()
+DELTA = b'{"op":"delta","session":%d,"moves":%d,"set":[[%d,%d],[%d,0]],"solved":%s}\n'
+
+
+# Function to encode a reply as one JSON line
+def encode_reply(reply):
+    return (json.dumps(reply, separators=(",", ":")) + "\n").encode()
+
+
+class Session:
+    """One game: the board, its seed, the move count and when it started."""
+
+    __slots__ = ("board", "seed", "moves", "started", "finished")
+
+    def __init__(self, board, seed):
+        self.board = board
+        self.seed = seed
+        self.moves = 0
+        self.started = time.monotonic()
+        self.finished = None  # Seconds taken, once solved
+
+
+class CommandError(Exception):
+    """Raised for a command that cannot be carried out; the message goes back to the client."""
+
+
+class GameServer:
+    """Runs every session and answers the commands of all connections."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.sessions = {}  # Session id -> Session
+        self.stats = {"connections": 0, "sessions": 0, "moves": 0, "solved": 0}
+        self._next_id = 1
+        self._rng = random.Random()
+
+    # Commands
+    def dispatch(self, line, owned):
+        """Handle one command line for a connection owning the session ids in owned; return the reply line."""
+        try:
+            command = json.loads(line)
+            if not isinstance(command, dict):
+                raise CommandError("Command must be a JSON object")
+            op = command.get("op")
+            handler = self._handlers.get(op) if isinstance(op, str) else None
+            if handler is None:
+                raise CommandError(f"Unknown op {op!r}")
+            return handler(self, command, owned)
+        except CommandError as e:
+            return encode_reply({"op": "error", "error": str(e)})
+        except (ValueError, RecursionError):  # RecursionError: nested too deep for json to parse
+            return encode_reply({"op": "error", "error": "Command is not valid JSON"})
+
+    def _session(self, command, owned):
+        session_id = command.get("session")
+        if type(session_id) is not int or session_id not in owned:
+            raise CommandError(f"No session {session_id!r} on this connection")
+        return session_id, self.sessions[session_id]
+
+    def _state(self, session_id, session):
+        return encode_reply({"op": "state", "session": session_id, "size": session.board.size, "seed": session.seed,
+                             "tiles": list(session.board.tiles), "moves": session.moves,
+                             "solved": session.finished is not None})
+
+    def _new(self, command, owned):
+        size = command.get("size", 4)
+        seed = command.get("seed")
+        if type(size) is not int or not 2 <= size <= MAX_GRID_SIZE:
+            raise CommandError(f"Size must be from 2 to {MAX_GRID_SIZE}")
+        if seed is None:
+            seed = self._rng.randrange(2 ** 63)
+        elif type(seed) is not int or not 0 <= seed < 2 ** 64:
+            raise CommandError("Seed must be an unsigned 64-bit integer")
+        if len(self.sessions) >= self.max_sessions:
+            raise CommandError("Server is full")
+        session_id = self._next_id
+        self._next_id += 1
+        session = self.sessions[session_id] = Session(generate_board(size, seed=seed), seed)
+        owned.add(session_id)
+        self.stats["sessions"] += 1
+        return self._state(session_id, session)
+
+    def _move(self, command, owned):
+        session_id, session = self._session(command, owned)
+        board = session.board
+        row, col = command.get("row"), command.get("col")
+        # type() rather than isinstance(), so true and false are not taken for 1 and 0
+        if not (type(row) is int and type(col) is int and 0 <= row < board.size and 0 <= col < board.size):
+            raise CommandError("Move needs a row and col on the board")
+        if session.finished is not None:
+            raise CommandError("Puzzle is already solved")
+        previous_empty = slide_tile(board, (row, col))
+        if previous_empty == -1:
+            raise CommandError("Tile is not next to the empty space")
+        session.moves += 1
+        self.stats["moves"] += 1
+        solved = is_puzzle_completed(board)
+        if solved:
+            session.finished = time.monotonic() - session.started
+            self.stats["solved"] += 1
+        return DELTA % (session_id, session.moves, previous_empty, board.tiles[previous_empty], board.blank,
+                        b"true" if solved else b"false")
+
+    def _get_state(self, command, owned):
+        return self._state(*self._session(command, owned))
+
+    def _close(self, command, owned):
+        session_id, session = self._session(command, owned)
+        owned.discard(session_id)
+        del self.sessions[session_id]
+        return encode_reply({"op": "closed", "session": session_id, "moves": session.moves,
+                             "solved": session.finished is not None, "time": session.finished})
+
+    _handlers = {"new": _new, "move": _move, "state": _get_state, "close": _close}
+
+    # Connections
+    async def handle_connection(self, reader, writer):
+        owned = set()  # Sessions belonging to this connection
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break  # Reset, or a line longer than the stream limit
+                if not line:
+                    break
+                writer.write(self.dispatch(line, owned))
+                if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                    await writer.drain()  # Stop reading while a slow client catches up
+        finally:
+            for session_id in owned:
+                del self.sessions[session_id]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass  # Reset by the client, or the server is shutting down
+
+    async def serve(self, host=HOST, port=PORT, unix_path=None, ready=None):
+        """Accept connections until cancelled. ready, if given, is called with the listening server."""
+        if unix_path is not None:
+            if os.path.exists(unix_path) and stat.S_ISSOCK(os.stat(unix_path).st_mode):
+                os.unlink(unix_path)  # Left behind by a server that did not shut down cleanly
+            server = await asyncio.start_unix_server(self.handle_connection, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host slider puzzle sessions over TCP or a Unix socket")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    args = parser.parse_args()
+
+    game_server = GameServer(args.max_sessions)
+    where = args.unix or f"{args.host}:{args.port}"
+    try:
+        asyncio.run(game_server.serve(args.host, args.port, args.unix,
+                                      ready=lambda server: print(f"Listening on {where}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    stats = game_server.stats
+    print(f"{stats['connections']} connections, {stats['sessions']} sessions, {stats['moves']} moves, "
+          f"{stats['solved']} solved")
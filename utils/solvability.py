@@ -0,0 +1,69 @@
+# Inversion counting and solvability checks for the slider puzzle.
+#
+# A board is solvable when the parity of its tile inversions matches the parity
+# rule for its size: on odd boards the inversions must be even, on even boards
+# the inversions plus the row of the empty space (counted from the bottom,
+# starting at 1) must be odd.
+
+
+# Function to count inversions in a flat sequence of tiles (0 or None for the empty space)
+def count_flat_inversions(tiles):
+    """Count pairs of tiles that are out of order, in O(n log n) with a Fenwick tree."""
+    values = [tile for tile in tiles if tile]
+    size = max(values, default=0)
+    tree = [0] * (size + 1)
+    inversions = 0
+    # Walk right to left, counting the smaller tiles already seen
+    for value in reversed(values):
+        i = value - 1
+        while i > 0:
+            inversions += tree[i]
+            i -= i & -i
+        i = value
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+
+# Function to check solvability of a flat sequence of tiles
+def is_flat_solvable(tiles, grid_size):
+    inversions = count_flat_inversions(tiles)
+    if grid_size % 2 == 1:
+        return inversions % 2 == 0
+    empty_index = next(i for i, tile in enumerate(tiles) if not tile)
+    empty_row_from_bottom = grid_size - empty_index // grid_size
+    return (inversions + empty_row_from_bottom) % 2 == 1
+
+
+# Function to check solvability of many boards at once
+def is_solvable_batch(boards, chunk_size=None):
+    """Return a boolean mask saying which boards are solvable.
+
+    boards is an (N, n, n) integer array with 0 for the empty space. Inversion
+    parity is computed with vectorised pairwise comparisons, chunk_size boards
+    at a time to keep memory bounded.
+    """
+    import numpy as np
+
+    boards = np.asarray(boards)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError("boards must have shape (N, n, n)")
+    count, n = boards.shape[0], boards.shape[1]
+    cells = n * n
+    flat = boards.reshape(count, cells)
+    if chunk_size is None:
+        chunk_size = max(1, (1 << 24) // (cells * cells))
+
+    # Only pairs (i, j) with i < j count, and the empty space never counts
+    upper = np.triu(np.ones((cells, cells), dtype=bool), k=1)
+    parity = np.empty(count, dtype=np.int64)
+    for start in range(0, count, chunk_size):
+        chunk = flat[start:start + chunk_size]
+        out_of_order = (chunk[:, :, None] > chunk[:, None, :]) & (chunk[:, None, :] != 0) & upper
+        parity[start:start + chunk_size] = np.count_nonzero(out_of_order, axis=(1, 2)) & 1
+
+    if n % 2 == 1:
+        return parity == 0
+    empty_row_from_bottom = n - np.argmax(flat == 0, axis=1) // n
+    return ((parity + empty_row_from_bottom) & 1) == 1
@@ -0,0 +1,277 @@
+import time
+from functools import lru_cache
+from utils.board import get_distances, get_neighbours
+from utils.solvability import is_flat_solvable
+
+# Optimal solver for the slider puzzle.
+#
+# Boards use the same list-of-lists layout as generate_solved_grid() in main.py,
+# with None for the empty space. Internally the board is flattened into a list
+# where 0 is the empty space, and solutions are returned as the (row, col)
+# positions to click, in order, so each one can be passed straight to move_tile().
+
+
+class UnsolvableError(ValueError):
+    """Raised when a board cannot reach the solved state."""
+
+
+class SolverTimeout(Exception):
+    """Raised when the search runs past its time limit."""
+
+
+class SolverCancelled(Exception):
+    """Raised when the search is cancelled from another thread."""
+
+
+# Function to flatten a grid into a list with 0 for the empty space
+def flatten_grid(grid):
+    return [0 if tile is None else tile for row in grid for tile in row]
+
+
+# Function to flatten a grid after checking that it is a real board
+def check_grid(grid):
+    """Return the flattened tiles of grid, like flatten_grid().
+
+    Raises ValueError unless the grid is square and holds the tiles 1 to n*n - 1
+    and one empty space, each exactly once.
+    """
+    n = len(grid)
+    if n < 2 or any(len(row) != n for row in grid):
+        raise ValueError("Board must be a square list of lists, at least 2x2")
+    tiles = flatten_grid(grid)
+    if any(type(tile) is not int for tile in tiles) or sorted(tiles) != list(range(n * n)):
+        raise ValueError(f"Board must hold the tiles 1 to {n * n - 1} and one empty space, each once")
+    return tiles
+
+
+# Function to build the per-size lookup tables used by the search
+@lru_cache(maxsize=None)
+def get_tables(grid_size):
+    """Return (neighbours, distance) tables for a grid_size x grid_size board.
+
+    neighbours[pos] lists the positions the empty space can move to from pos and
+    distance[tile][pos] is the Manhattan distance of tile from its goal when it sits at pos.
+    """
+    return get_neighbours(grid_size), get_distances(grid_size)
+
+
+# Function to get the length of the longest increasing subsequence
+def _longest_increasing(values):
+    tails = []
+    for value in values:
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tails[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(tails):
+            tails.append(value)
+        else:
+            tails[lo] = value
+    return len(tails)
+
+
+@lru_cache(maxsize=None)
+def _line_conflicts(goal_positions):
+    # Tiles that have to leave the line so the rest are in goal order.
+    return len(goal_positions) - _longest_increasing(goal_positions)
+
+
+# Function to count linear conflicts in one row of a flat board
+def row_conflicts(tiles, grid_size, row):
+    n = grid_size
+    goals = []
+    for pos in range(row * n, row * n + n):
+        tile = tiles[pos]
+        if tile and (tile - 1) // n == row:
+            goals.append((tile - 1) % n)
+    return _line_conflicts(tuple(goals)) if len(goals) > 1 else 0
+
+
+# Function to count linear conflicts in one column of a flat board
+def col_conflicts(tiles, grid_size, col):
+    n = grid_size
+    goals = []
+    for pos in range(col, n * n, n):
+        tile = tiles[pos]
+        if tile and (tile - 1) % n == col:
+            goals.append((tile - 1) // n)
+    return _line_conflicts(tuple(goals)) if len(goals) > 1 else 0
+
+
+# Function to compute the Manhattan distance heuristic of a grid
+def manhattan_distance(grid):
+    tiles = flatten_grid(grid)
+    _, distance = get_tables(len(grid))
+    return sum(distance[tile][pos] for pos, tile in enumerate(tiles))
+
+
+# Function to compute the Manhattan distance + linear conflict heuristic of a grid
+def linear_conflict_distance(grid):
+    n = len(grid)
+    tiles = flatten_grid(grid)
+    conflicts = sum(row_conflicts(tiles, n, i) for i in range(n)) + sum(col_conflicts(tiles, n, i) for i in range(n))
+    return manhattan_distance(grid) + 2 * conflicts
+
+
+# Function to find the optimal solution of a grid with IDA*
+def solve(grid, timeout=None, database=None, cancel=None):
+    """Return the shortest list of (row, col) tile positions that solves the grid.
+
+    The grid is not modified. timeout is in seconds; SolverTimeout is raised when
+    it runs out. database is an optional AdditivePatternDatabase (see
+    utils.pattern_db) for the same grid size; its value, or its value for the
+    board mirrored in the main diagonal, is used whenever it beats Manhattan
+    distance + linear conflict. cancel is an optional threading.Event;
+    setting it stops the search with SolverCancelled. Raises ValueError if the
+    grid is not a valid board and UnsolvableError if it cannot be solved.
+    """
+    n = len(grid)
+    tiles = check_grid(grid)
+    if not is_flat_solvable(tiles, n):
+        raise UnsolvableError("Grid is not solvable")
+
+    neighbours, distance = get_tables(n)
+    deadline = None if timeout is None else time.perf_counter() + timeout
+
+    rows = [row_conflicts(tiles, n, i) for i in range(n)]
+    cols = [col_conflicts(tiles, n, i) for i in range(n)]
+    md = sum(distance[tile][pos] for pos, tile in enumerate(tiles))
+    lc = sum(rows) + sum(cols)
+
+    if database is not None and database.grid_size != n:
+        raise ValueError("Pattern database is for a different grid size")
+    cells = n * n
+    # The board mirrored in its main diagonal takes exactly as many moves to solve, so the
+    # tables are also looked up for the mirror image and the larger value is used
+    mirror_pos = [(pos % n) * n + pos // n for pos in range(cells)]
+    mirror_tile = [0] + [mirror_pos[tile - 1] + 1 for tile in range(1, cells)]
+    if database is not None:
+        # Table indexes are updated in place as tiles move; lookups read the mapped buffer directly
+        tables, group_of, weight_of = database.tables, database.group_of, database.weight_of
+        mirror_group = [group_of[mirror_tile[tile]] for tile in range(cells)]
+        mirror_weight = [weight_of[mirror_tile[tile]] for tile in range(cells)]
+        mirrored = [0] * cells
+        for pos, tile in enumerate(tiles):
+            mirrored[mirror_pos[pos]] = mirror_tile[tile]
+        indexes = database.indexes(tiles)
+        mirror_indexes = database.indexes(mirrored)
+        pdb = database.value(indexes)
+        mirror_pdb = database.value(mirror_indexes)
+    else:
+        tables = indexes = mirror_indexes = None
+        group_of = mirror_group = [-1] * cells
+        weight_of = mirror_weight = None
+        pdb = mirror_pdb = 0
+
+    path = []
+    nodes = 0
+
+    def search(blank, previous, g, bound, md, lc, pdb, mirror_pdb):
+        # The caller has already checked that this board is within the bound
+        nonlocal nodes
+        if md == 0:
+            return True
+        nodes += 1
+        if nodes & 0x3FF == 0:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise SolverTimeout("Solver ran out of time")
+            if cancel is not None and cancel.is_set():
+                raise SolverCancelled("Solver was cancelled")
+
+        g += 1
+        smallest = None
+        for nxt in neighbours[blank]:
+            if nxt == previous:
+                continue
+            tile = tiles[nxt]
+            # Work out the cheap estimates first and skip the move without making it if they
+            # already go over the bound; most moves are cut off here
+            new_md = md - distance[tile][nxt] + distance[tile][blank]
+            h = new_md
+            new_pdb = pdb
+            group = group_of[tile]
+            if group >= 0:
+                table = tables[group]
+                old_index = indexes[group]
+                new_index = old_index + (blank - nxt) * weight_of[tile]
+                new_pdb += table[new_index] - table[old_index]
+                if new_pdb > h:
+                    h = new_pdb
+            new_mirror_pdb = mirror_pdb
+            mirror = mirror_group[tile]
+            if mirror >= 0:
+                table = tables[mirror]
+                old_mirror_index = mirror_indexes[mirror]
+                new_mirror_index = old_mirror_index + (mirror_pos[blank] - mirror_pos[nxt]) * mirror_weight[tile]
+                new_mirror_pdb += table[new_mirror_index] - table[old_mirror_index]
+                if new_mirror_pdb > h:
+                    h = new_mirror_pdb
+            f = g + h
+            if f > bound:
+                if smallest is None or f < smallest:
+                    smallest = f
+                continue
+
+            # Slide the tile from nxt into the blank
+            tiles[blank] = tile
+            tiles[nxt] = 0
+            new_lc = lc
+            if nxt - blank in (n, -n):  # Vertical move changes two rows
+                old_row, new_row = nxt // n, blank // n
+                a = row_conflicts(tiles, n, old_row)
+                b = row_conflicts(tiles, n, new_row)
+                new_lc += a + b - rows[old_row] - rows[new_row]
+                saved = rows[old_row], rows[new_row]
+                rows[old_row], rows[new_row] = a, b
+            else:  # Horizontal move changes two columns
+                old_col, new_col = nxt % n, blank % n
+                a = col_conflicts(tiles, n, old_col)
+                b = col_conflicts(tiles, n, new_col)
+                new_lc += a + b - cols[old_col] - cols[new_col]
+                saved = cols[old_col], cols[new_col]
+                cols[old_col], cols[new_col] = a, b
+
+            result = g + new_md + 2 * new_lc
+            if result <= bound:
+                if group >= 0:
+                    indexes[group] = new_index
+                if mirror >= 0:
+                    mirror_indexes[mirror] = new_mirror_index
+                path.append(nxt)
+                result = search(nxt, blank, g, bound, new_md, new_lc, new_pdb, new_mirror_pdb)
+                if result is True:
+                    return True
+                path.pop()
+                if group >= 0:
+                    indexes[group] = old_index
+                if mirror >= 0:
+                    mirror_indexes[mirror] = old_mirror_index
+
+            # Undo the move
+            if nxt - blank in (n, -n):
+                rows[old_row], rows[new_row] = saved
+            else:
+                cols[old_col], cols[new_col] = saved
+            tiles[nxt] = tile
+            tiles[blank] = 0
+            if smallest is None or result < smallest:
+                smallest = result
+        return smallest
+
+    blank = tiles.index(0)
+    bound = max(md + 2 * lc, pdb, mirror_pdb)
+    while True:
+        result = search(blank, None, 0, bound, md, lc, pdb, mirror_pdb)
+        if result is True:
+            return [divmod(pos, n) for pos in path]
+        bound = result
+
+
+# Function to get the next optimal move for a grid
+def get_hint(grid, timeout=None, database=None):
+    """Return the (row, col) of the tile to move next, or None if already solved."""
+    solution = solve(grid, timeout=timeout, database=database)
+    return solution[0] if solution else None
@@ -0,0 +1,20 @@
+import sys
+
+# Sound on/off switch shared by the menu and the sound effects.
+
+sound_enabled = True
+
+
+# Function to turn sound effects on or off
+def toggle_sound():
+    global sound_enabled
+    sound_enabled = not sound_enabled
+    pygame = sys.modules.get("pygame")  # Nothing can be playing if pygame was never imported
+    if not sound_enabled and pygame is not None and pygame.mixer.get_init():
+        pygame.mixer.stop()  # Cut off anything still playing
+    return sound_enabled
+
+
+# Function to check if sound effects should play
+def is_sound_enabled():
+    return sound_enabled